@@ -1,9 +1,17 @@
+import uuid
 from decimal import Decimal
-from typing import List
+from typing import List, Callable, Dict, Optional
 
 from graphs.calculator import DistanceCalculatorFactory, DistanceCalculator
-from graphs.dto import NodeDTO, Graph
-from graphs.enums import DistanceCalculationStrategy
+from graphs.dto import (
+    NodeDTO,
+    Graph,
+    DenseGraph,
+    LazyGraph,
+    Cost,
+    FIXED_POINT_SCALE,
+)
+from graphs.enums import DistanceCalculationStrategy, CostMode, GraphType
 from graphs.transformer import NodeTransformerFactory, NodeTransformer
 from locations.model import Location
 from users.model import Rider
@@ -12,29 +20,115 @@ PRECISION = Decimal("1.00")
 
 
 class GraphBuilder:
+    _GRAPH_TYPE_TO_GRAPH = {
+        GraphType.ADJACENCY_LIST: Graph,
+        GraphType.DENSE: DenseGraph,
+        GraphType.LAZY: LazyGraph,
+    }
+
     @classmethod
-    def build(cls, rider: Rider, locations: List[Location]) -> Graph:
-        graph = Graph()
+    def build(
+        cls,
+        rider: Rider,
+        locations: List[Location],
+        cost_mode: CostMode = CostMode.DECIMAL,
+        graph_type: GraphType = GraphType.ADJACENCY_LIST,
+        use_distance_cache: bool = False,
+        customer_restaurant_map: Optional[Dict[uuid.UUID, List[uuid.UUID]]] = None,
+    ) -> Graph:
+        """
+        customer_restaurant_map is only used by GraphType.LAZY, to skip edges
+        from the rider into customers whose restaurants are not visited yet.
+        """
+        graph: Graph = cls._GRAPH_TYPE_TO_GRAPH[graph_type](cost_mode)
         vehicle_speed: Decimal = rider.vehicle_speed
-        node_transformer: NodeTransformer = NodeTransformerFactory.get_transformer(
-            DistanceCalculationStrategy.HAVERSINE
-        )
-        distance_calculator: DistanceCalculator = (
-            DistanceCalculatorFactory.get_calculator(
-                DistanceCalculationStrategy.HAVERSINE
-            )
+        graph.vehicle_speed = vehicle_speed
+        node_transformer: NodeTransformer = cls._get_node_transformer()
+        distance_calculator: DistanceCalculator = cls._get_distance_calculator(
+            use_distance_cache
         )
         nodes: List[NodeDTO] = node_transformer.transform_many(locations)
         rider_node: NodeDTO = next(filter(lambda node: node.is_rider(), nodes))
         graph.set_root(rider_node)
         graph.add_nodes(nodes)
-        for from_node in nodes:
-            for to_node in nodes:
-                if from_node != to_node:
-                    distance: Decimal = distance_calculator.calculate(
-                        from_node, to_node
-                    )
-                    node_weight: Decimal = distance / vehicle_speed
-                    graph.add_edge(from_node, to_node, node_weight.quantize(PRECISION))
+        to_weight: Callable[[float], Cost] = cls._get_weight_converter(
+            graph, vehicle_speed
+        )
+        weight_function: Callable[[NodeDTO, NodeDTO], Cost] = (
+            lambda from_node, to_node: to_weight(
+                distance_calculator.calculate_float(from_node, to_node)
+            )
+        )
+        if isinstance(graph, LazyGraph):
+            graph.set_weight_function(weight_function, customer_restaurant_map)
+            return graph
+
+        graph.set_weight_function(weight_function)
+        distances: List[List[float]] = distance_calculator.calculate_matrix(nodes)
+        for from_index, from_node in enumerate(nodes):
+            row: List[float] = distances[from_index]
+            for to_index, to_node in enumerate(nodes):
+                if from_index != to_index:
+                    graph.add_edge(from_node, to_node, to_weight(row[to_index]))
 
         return graph
+
+    @classmethod
+    def add_location(cls, graph: Graph, location: Location) -> NodeDTO:
+        """
+        Adds a location to a built graph, computing only its O(N) edges.
+        """
+        node: NodeDTO = cls._get_node_transformer().transform_one(location)
+        graph.connect_node(node)
+        return node
+
+    @classmethod
+    def remove_location(cls, graph: Graph, object_id: uuid.UUID):
+        node: Optional[NodeDTO] = graph.get_node(object_id)
+        if node is None:
+            raise Exception(f"No node for object {object_id} in the graph")
+
+        graph.remove_node(node)
+
+    @classmethod
+    def move_location(cls, graph: Graph, location: Location) -> NodeDTO:
+        """
+        Moves the node of location.object_id (e.g. a rider GPS update of the root)
+        to the new coordinates, computing only its O(N) edges.
+        """
+        node: Optional[NodeDTO] = graph.get_node(location.object_id)
+        if node is None:
+            raise Exception(f"No node for object {location.object_id} in the graph")
+
+        moved_node: NodeDTO = cls._get_node_transformer().transform_one(location)
+        graph.move_node(node, moved_node)
+        return moved_node
+
+    @classmethod
+    def _get_node_transformer(cls) -> NodeTransformer:
+        return NodeTransformerFactory.get_transformer(
+            DistanceCalculationStrategy.HAVERSINE
+        )
+
+    @classmethod
+    def _get_distance_calculator(cls, use_distance_cache: bool) -> DistanceCalculator:
+        if use_distance_cache:
+            return DistanceCalculatorFactory.get_cached_calculator(
+                DistanceCalculationStrategy.HAVERSINE
+            )
+
+        return DistanceCalculatorFactory.get_calculator(
+            DistanceCalculationStrategy.HAVERSINE
+        )
+
+    @classmethod
+    def _get_weight_converter(
+        cls, graph: Graph, vehicle_speed: Decimal
+    ) -> Callable[[float], Cost]:
+        if graph.is_fixed_point():
+            scale: float = FIXED_POINT_SCALE / float(vehicle_speed)
+            return lambda distance: round(distance * scale)
+
+        return lambda distance: (
+            Decimal(distance).quantize(PRECISION) / vehicle_speed
+        ).quantize(PRECISION)
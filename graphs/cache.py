@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    size: int
+    capacity: int
+    expirations: int = 0
+
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self):
+        return {**self.__dict__, "hit_ratio": self.hit_ratio()}
+
+
+class LRUCache:
+    """
+    Bounded, thread safe LRU map with hit / miss counters.
+    With ttl_seconds, an entry older than that is dropped on lookup and
+    counted as a miss (and an expiration).
+    """
+
+    def __init__(self, capacity: int, ttl_seconds: Optional[float] = None):
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = (
+            OrderedDict()
+        )
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.lock:
+            entry = self._entries.get(key)
+            if (
+                entry is not None
+                and entry[1] is not None
+                and entry[1] <= time.monotonic()
+            ):
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        expires_at: Optional[float] = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        )
+        with self.lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.expirations = 0
+
+    def get_stats(self) -> CacheStats:
+        with self.lock:
+            return CacheStats(
+                self.hits,
+                self.misses,
+                len(self._entries),
+                self.capacity,
+                self.expirations,
+            )
@@ -1,10 +1,17 @@
 import math
 from abc import ABC, abstractmethod
 from decimal import Decimal
+from typing import List, Tuple
 
+from graphs.cache import LRUCache, CacheStats
 from graphs.dto import NodeDTO, HaversineNode
 from graphs.enums import DistanceCalculationStrategy
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 PRECISION = Decimal("1.00")
 
 
@@ -15,6 +22,27 @@ class DistanceCalculator(ABC):
     def calculate(cls, node1: NodeDTO, node2: NodeDTO) -> Decimal:
         pass
 
+    @classmethod
+    @abstractmethod
+    def calculate_float(cls, node1: NodeDTO, node2: NodeDTO) -> float:
+        pass
+
+    @classmethod
+    def calculate_matrix(cls, nodes: List[NodeDTO]) -> List[List[float]]:
+        """
+        All pairs distances, matrix[i][j] between nodes[i] and nodes[j].
+        Distances are symmetric so each pair is computed once.
+        """
+        size = len(nodes)
+        matrix: List[List[float]] = [[0.0] * size for _ in range(size)]
+        for i in range(size):
+            for j in range(i + 1, size):
+                distance: float = cls.calculate_float(nodes[i], nodes[j])
+                matrix[i][j] = distance
+                matrix[j][i] = distance
+
+        return matrix
+
     @classmethod
     @abstractmethod
     def get_strategy(cls) -> DistanceCalculationStrategy:
@@ -26,6 +54,10 @@ class HaversineDistanceCalculator(DistanceCalculator):
 
     @classmethod
     def calculate(cls, node1: HaversineNode, node2: HaversineNode) -> Decimal:
+        return Decimal(cls.calculate_float(node1, node2)).quantize(PRECISION)
+
+    @classmethod
+    def calculate_float(cls, node1: HaversineNode, node2: HaversineNode) -> float:
         lat1 = float(node1.latitude)
         lat2 = float(node2.latitude)
         lon1 = float(node1.longitude)
@@ -42,20 +74,136 @@ class HaversineDistanceCalculator(DistanceCalculator):
         ) * math.cos(lat2)
 
         c = 2 * math.asin(math.sqrt(a))
-        return Decimal(cls.EARTH_RADIUS_KM * c).quantize(PRECISION)
+        return cls.EARTH_RADIUS_KM * c
+
+    @classmethod
+    def calculate_matrix(cls, nodes: List[HaversineNode]) -> List[List[float]]:
+        if np is not None:
+            return cls._calculate_matrix_numpy(nodes)
+
+        size = len(nodes)
+        latitudes = [math.radians(float(node.latitude)) for node in nodes]
+        longitudes = [math.radians(float(node.longitude)) for node in nodes]
+        cosines = [math.cos(latitude) for latitude in latitudes]
+        matrix: List[List[float]] = [[0.0] * size for _ in range(size)]
+        for i in range(size):
+            lat1, lon1, cos1 = latitudes[i], longitudes[i], cosines[i]
+            row = matrix[i]
+            for j in range(i + 1, size):
+                a = (
+                    math.sin((latitudes[j] - lat1) / 2) ** 2
+                    + math.sin((longitudes[j] - lon1) / 2) ** 2 * cos1 * cosines[j]
+                )
+                distance = cls.EARTH_RADIUS_KM * 2 * math.asin(math.sqrt(a))
+                row[j] = distance
+                matrix[j][i] = distance
+
+        return matrix
+
+    @classmethod
+    def _calculate_matrix_numpy(cls, nodes: List[HaversineNode]) -> List[List[float]]:
+        latitudes = np.radians(np.array([float(node.latitude) for node in nodes]))
+        longitudes = np.radians(np.array([float(node.longitude) for node in nodes]))
+        d_lat = latitudes[:, None] - latitudes[None, :]
+        d_lon = longitudes[:, None] - longitudes[None, :]
+        cosines = np.cos(latitudes)
+        a = (
+            np.sin(d_lat / 2) ** 2
+            + np.sin(d_lon / 2) ** 2 * cosines[:, None] * cosines[None, :]
+        )
+        c = 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+        return (cls.EARTH_RADIUS_KM * c).tolist()
 
     @classmethod
     def get_strategy(cls) -> DistanceCalculationStrategy:
         return DistanceCalculationStrategy.HAVERSINE
 
 
+class CachedDistanceCalculator(DistanceCalculator):
+    """
+    Shared LRU cache in front of a calculator, keyed by the quantized
+    (latitude, longitude) pair of both nodes. Distances are symmetric so the
+    two coordinates are stored in sorted order.
+    """
+
+    COORDINATE_DIGITS = 5
+    DEFAULT_CAPACITY = 100_000
+
+    def __init__(
+        self, calculator: DistanceCalculator, capacity: int = DEFAULT_CAPACITY
+    ):
+        self.calculator = calculator
+        self.cache = LRUCache(capacity)
+
+    def calculate(self, node1: HaversineNode, node2: HaversineNode) -> Decimal:
+        return Decimal(self.calculate_float(node1, node2)).quantize(PRECISION)
+
+    def calculate_float(self, node1: HaversineNode, node2: HaversineNode) -> float:
+        return self._get_distance(
+            node1, node2, self._get_key(node1), self._get_key(node2)
+        )
+
+    def calculate_matrix(self, nodes: List[HaversineNode]) -> List[List[float]]:
+        size = len(nodes)
+        keys: List[Tuple[float, float]] = [self._get_key(node) for node in nodes]
+        matrix: List[List[float]] = [[0.0] * size for _ in range(size)]
+        for i in range(size):
+            for j in range(i + 1, size):
+                distance: float = self._get_distance(
+                    nodes[i], nodes[j], keys[i], keys[j]
+                )
+                matrix[i][j] = distance
+                matrix[j][i] = distance
+
+        return matrix
+
+    def get_strategy(self) -> DistanceCalculationStrategy:
+        return self.calculator.get_strategy()
+
+    def get_stats(self) -> CacheStats:
+        return self.cache.get_stats()
+
+    def _get_distance(
+        self,
+        node1: HaversineNode,
+        node2: HaversineNode,
+        key1: Tuple[float, float],
+        key2: Tuple[float, float],
+    ) -> float:
+        key = (key1, key2) if key1 <= key2 else (key2, key1)
+        distance = self.cache.get(key)
+        if distance is None:
+            distance = self.calculator.calculate_float(node1, node2)
+            self.cache.put(key, distance)
+
+        return distance
+
+    @classmethod
+    def _get_key(cls, node: HaversineNode) -> Tuple[float, float]:
+        return (
+            round(float(node.latitude), cls.COORDINATE_DIGITS),
+            round(float(node.longitude), cls.COORDINATE_DIGITS),
+        )
+
+
 class DistanceCalculatorFactory:
     _CALCULATION_STRATEGY_TO_CALCULATOR = {
         DistanceCalculationStrategy.HAVERSINE: HaversineDistanceCalculator(),
     }
+    _CALCULATION_STRATEGY_TO_CACHED_CALCULATOR = {
+        DistanceCalculationStrategy.HAVERSINE: CachedDistanceCalculator(
+            HaversineDistanceCalculator()
+        ),
+    }
 
     @classmethod
     def get_calculator(
         cls, strategy: DistanceCalculationStrategy
     ) -> DistanceCalculator:
         return cls._CALCULATION_STRATEGY_TO_CALCULATOR.get(strategy)
+
+    @classmethod
+    def get_cached_calculator(
+        cls, strategy: DistanceCalculationStrategy
+    ) -> CachedDistanceCalculator:
+        return cls._CALCULATION_STRATEGY_TO_CACHED_CALCULATOR.get(strategy)
@@ -1,12 +1,18 @@
+import dataclasses
 import json
 import uuid
+from array import array
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import List, Dict
+from typing import List, Dict, Union, Optional, Callable, Tuple
 
+from graphs.enums import CostMode
 from locations.enums import LocationType
 
 PRECISION = Decimal("1.00")
+FIXED_POINT_SCALE = 100
+
+Cost = Union[Decimal, int]
 
 
 @dataclass(frozen=True)
@@ -60,21 +66,41 @@ class HaversineNode(NodeDTO):
 class NodeEdge:
     from_node: NodeDTO
     to_node: NodeDTO
-    weight: Decimal
+    weight: Cost
 
     def __str__(self):
         return f"From Node: {self.from_node.object_id}, To Node: {self.to_node.object_id}, Weight: {self.weight}"
 
 
 class Graph:
-    def __init__(self):
+    """
+    In CostMode.FIXED_POINT, edge weights and min available times are ints in
+    1 / FIXED_POINT_SCALE units (hundredths of a minute) and finders convert
+    back to Decimal only when building the RouteDTO output.
+    elapsed_cost is the time already spent when the route starts at root;
+    min available times are reported relative to it.
+    weight_function (set by GraphBuilder) gives the weight between two nodes and
+    lets connect_node / move_node compute only the edges touching one node.
+    """
+
+    def __init__(self, cost_mode: CostMode = CostMode.DECIMAL):
         self.root = None
         self.nodes: List[NodeDTO] = []
         self.edge_map: Dict[NodeDTO, List[NodeEdge]] = {}
+        self.cost_mode = cost_mode
+        self.elapsed_cost: Cost = self.zero_cost()
+        self.weight_function: Optional[Callable[[NodeDTO, NodeDTO], Cost]] = None
+        self.vehicle_speed: Optional[Decimal] = None
 
     def set_root(self, root: NodeDTO):
         self.root = root
 
+    def set_weight_function(self, weight_function: Callable[[NodeDTO, NodeDTO], Cost]):
+        self.weight_function = weight_function
+
+    def get_node(self, object_id: uuid.UUID) -> Optional[NodeDTO]:
+        return next((node for node in self.nodes if node.object_id == object_id), None)
+
     def get_customer_nodes(self):
         return list(filter(lambda node: node.is_customer(), self.nodes))
 
@@ -90,11 +116,278 @@ class Graph:
     def add_nodes(self, nodes: List[NodeDTO]):
         self.nodes.extend(nodes)
 
-    def add_edge(self, from_node: NodeDTO, to_node: NodeDTO, weight: Decimal):
+    def add_edge(self, from_node: NodeDTO, to_node: NodeDTO, weight: Cost):
         if from_node not in self.edge_map:
             self.edge_map[from_node] = []
 
         self.edge_map[from_node].append(NodeEdge(from_node, to_node, weight))
 
     def get_edges(self, node: NodeDTO) -> List[NodeEdge]:
+        return self.edge_map.get(node, [])
+
+    def connect_node(self, node: NodeDTO):
+        """
+        Adds node with edges to and from every other node,
+        one weight_function call per pair.
+        """
+        self.add_node(node)
+        for other_node in self.nodes:
+            if other_node != node:
+                weight: Cost = self.weight_function(node, other_node)
+                self.add_edge(node, other_node, weight)
+                self.add_edge(other_node, node, weight)
+
+    def remove_node(self, node: NodeDTO):
+        self.nodes.remove(node)
+        self.edge_map.pop(node, None)
+        for from_node, edges in self.edge_map.items():
+            self.edge_map[from_node] = [edge for edge in edges if edge.to_node != node]
+        if node == self.root:
+            self.root = None
+
+    def move_node(self, node: NodeDTO, moved_node: NodeDTO):
+        """
+        Replaces node by moved_node (same object, new position), recomputing only
+        the edges touching it. Moving the root keeps it the root.
+        """
+        is_root: bool = node == self.root
+        self.remove_node(node)
+        self.connect_node(moved_node)
+        if is_root:
+            self.set_root(moved_node)
+
+    def is_fixed_point(self) -> bool:
+        return self.cost_mode == CostMode.FIXED_POINT
+
+    def zero_cost(self) -> Cost:
+        return 0 if self.is_fixed_point() else Decimal("0")
+
+    def to_cost(self, value: Decimal) -> Cost:
+        if self.is_fixed_point():
+            return int((value * FIXED_POINT_SCALE).to_integral_value())
+        return value
+
+    def to_decimal(self, cost: Cost) -> Decimal:
+        if self.is_fixed_point():
+            return (Decimal(cost) / FIXED_POINT_SCALE).quantize(PRECISION)
+        return cost
+
+    def get_min_available_time(self, node: NodeDTO) -> Cost:
+        return self.to_cost(node.min_available_time) - self.elapsed_cost
+
+    def get_subgraph(
+        self, root: NodeDTO, nodes: List[NodeDTO], elapsed_cost: Optional[Cost] = None
+    ) -> "Graph":
+        """
+        Graph of the same type over nodes, starting at root after elapsed_cost.
+        A non rider root is replaced by a rider typed copy so it is never a stop.
+        Edges are copied from this graph, edges into the root are dropped.
+        """
+        subgraph: Graph = type(self)(self.cost_mode)
+        subgraph.vehicle_speed = self.vehicle_speed
+        sub_root: NodeDTO = (
+            root
+            if root.is_rider()
+            else dataclasses.replace(root, node_type=LocationType.RIDER)
+        )
+        subgraph.set_root(sub_root)
+        subgraph.add_nodes([sub_root] + nodes)
+        if elapsed_cost is not None:
+            subgraph.elapsed_cost = elapsed_cost
+
+        node_set = set(nodes)
+        for from_node, sub_from_node in [(root, sub_root)] + list(zip(nodes, nodes)):
+            for edge in self.get_edges(from_node):
+                if edge.to_node in node_set and edge.to_node != from_node:
+                    subgraph.add_edge(sub_from_node, edge.to_node, edge.weight)
+
+        return subgraph
+
+
+class DenseGraph(Graph):
+    """
+    Graph backed by a flat row major weight matrix. Every node gets a dense index
+    in insertion order; weights are an array('q') in fixed point mode and a list
+    of Decimals otherwise. Missing edges hold MISSING_WEIGHT / None.
+    get_edges builds the NodeEdge row of a node once and memoizes it in edge_map;
+    set_weight drops the row it changes, adding or removing nodes drops them all.
+    """
+
+    MISSING_WEIGHT = -1
+
+    def __init__(self, cost_mode: CostMode = CostMode.DECIMAL):
+        super().__init__(cost_mode)
+        self.node_index_map: Dict[NodeDTO, int] = {}
+        self._missing: Optional[int] = (
+            self.MISSING_WEIGHT if self.is_fixed_point() else None
+        )
+        self.weights = self._new_weights(0)
+
+    def _new_weights(self, size: int):
+        if self.is_fixed_point():
+            return array("q", [self.MISSING_WEIGHT]) * (size * size)
+        return [None] * (size * size)
+
+    def _resize(self, old_size: int):
+        size = len(self.nodes)
+        weights = self._new_weights(size)
+        for row in range(old_size):
+            weights[row * size : row * size + old_size] = self.weights[
+                row * old_size : (row + 1) * old_size
+            ]
+        self.weights = weights
+
+    def add_node(self, node: NodeDTO):
+        self.add_nodes([node])
+
+    def add_nodes(self, nodes: List[NodeDTO]):
+        old_size = len(self.nodes)
+        for node in nodes:
+            self.node_index_map[node] = len(self.nodes)
+            self.nodes.append(node)
+        self._resize(old_size)
+        self.edge_map.clear()
+
+    def add_edge(self, from_node: NodeDTO, to_node: NodeDTO, weight: Cost):
+        self.set_weight(
+            self.node_index_map[from_node], self.node_index_map[to_node], weight
+        )
+
+    def get_edges(self, node: NodeDTO) -> List[NodeEdge]:
+        edges: Optional[List[NodeEdge]] = self.edge_map.get(node)
+        if edges is None:
+            size = len(self.nodes)
+            offset = self.node_index_map[node] * size
+            edges = [
+                NodeEdge(node, self.nodes[index], weight)
+                for index, weight in enumerate(self.weights[offset : offset + size])
+                if weight != self._missing
+            ]
+            self.edge_map[node] = edges
+
+        return edges
+
+    def remove_node(self, node: NodeDTO):
+        removed_index: int = self.node_index_map.pop(node)
+        old_size = len(self.nodes)
+        self.nodes.pop(removed_index)
+        kept_indices: List[int] = [
+            index for index in range(old_size) if index != removed_index
+        ]
+        weights = self._new_weights(len(self.nodes))
+        for new_row, old_row in enumerate(kept_indices):
+            offset = new_row * len(self.nodes)
+            old_offset = old_row * old_size
+            for new_column, old_column in enumerate(kept_indices):
+                weights[offset + new_column] = self.weights[old_offset + old_column]
+        self.weights = weights
+        for index in range(removed_index, len(self.nodes)):
+            self.node_index_map[self.nodes[index]] = index
+        self.edge_map.clear()
+        if node == self.root:
+            self.root = None
+
+    def move_node(self, node: NodeDTO, moved_node: NodeDTO):
+        index: int = self.node_index_map.pop(node)
+        self.node_index_map[moved_node] = index
+        self.nodes[index] = moved_node
+        self.edge_map.clear()
+        for other_index, other_node in enumerate(self.nodes):
+            if other_index != index:
+                weight: Cost = self.weight_function(moved_node, other_node)
+                self.set_weight(index, other_index, weight)
+                self.set_weight(other_index, index, weight)
+        if node == self.root:
+            self.set_root(moved_node)
+
+    def size(self) -> int:
+        return len(self.nodes)
+
+    def index_of(self, node: NodeDTO) -> int:
+        return self.node_index_map[node]
+
+    def get_node_at(self, index: int) -> NodeDTO:
+        return self.nodes[index]
+
+    def weight(self, from_index: int, to_index: int) -> Optional[Cost]:
+        weight = self.weights[from_index * len(self.nodes) + to_index]
+        return None if weight == self._missing else weight
+
+    def set_weight(self, from_index: int, to_index: int, weight: Cost):
+        self.weights[from_index * len(self.nodes) + to_index] = weight
+        self.edge_map.pop(self.nodes[from_index], None)
+
+
+class LazyGraph(Graph):
+    """
+    Graph whose edges are computed on first use: get_edges(node) builds the row
+    of node through weight_function and memoizes it, and a pair's weight is shared
+    by both directions (weight_function must be symmetric).
+    Edges that can never be taken are not generated at all: self edges, edges into
+    the root, edges from the root into customers that still need a restaurant and
+    edges from a customer into its own restaurants (visited before it).
+    """
+
+    def __init__(self, cost_mode: CostMode = CostMode.DECIMAL):
+        super().__init__(cost_mode)
+        self.weight_function: Optional[Callable[[NodeDTO, NodeDTO], Cost]] = None
+        self.customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]] = {}
+        self.pair_weights: Dict[Tuple[NodeDTO, NodeDTO], Cost] = {}
+
+    def set_weight_function(
+        self,
+        weight_function: Callable[[NodeDTO, NodeDTO], Cost],
+        customer_restaurant_map: Optional[Dict[uuid.UUID, List[uuid.UUID]]] = None,
+    ):
+        self.weight_function = weight_function
+        self.customer_restaurant_map = customer_restaurant_map or {}
+        self.edge_map.clear()
+        self.pair_weights.clear()
+
+    def connect_node(self, node: NodeDTO):
+        self.add_node(node)
+        self.edge_map.clear()
+
+    def remove_node(self, node: NodeDTO):
+        self.nodes.remove(node)
+        self.edge_map.clear()
+        for other_node in self.nodes:
+            self.pair_weights.pop((node, other_node), None)
+            self.pair_weights.pop((other_node, node), None)
+        if node == self.root:
+            self.root = None
+
+    def get_edges(self, node: NodeDTO) -> List[NodeEdge]:
+        if node not in self.edge_map:
+            self.edge_map[node] = (
+                self._generate_edges(node) if self.weight_function else []
+            )
+
         return self.edge_map[node]
+
+    def get_weight(self, from_node: NodeDTO, to_node: NodeDTO) -> Cost:
+        weight: Optional[Cost] = self.pair_weights.get((from_node, to_node))
+        if weight is None:
+            weight = self.weight_function(from_node, to_node)
+            self.pair_weights[(from_node, to_node)] = weight
+            self.pair_weights[(to_node, from_node)] = weight
+
+        return weight
+
+    def _generate_edges(self, node: NodeDTO) -> List[NodeEdge]:
+        return [
+            NodeEdge(node, to_node, self.get_weight(node, to_node))
+            for to_node in self.nodes
+            if self._is_possible(node, to_node)
+        ]
+
+    def _is_possible(self, from_node: NodeDTO, to_node: NodeDTO) -> bool:
+        if to_node == from_node or to_node == self.root:
+            return False
+        if from_node == self.root and to_node.is_customer():
+            return not self.customer_restaurant_map.get(to_node.object_id)
+        if from_node.is_customer() and to_node.is_restaurant():
+            return to_node.object_id not in self.customer_restaurant_map.get(
+                from_node.object_id, []
+            )
+        return True
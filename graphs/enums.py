@@ -3,3 +3,14 @@ from enum import Enum
 
 class DistanceCalculationStrategy(Enum):
     HAVERSINE = "haversine"
+
+
+class GraphType(Enum):
+    ADJACENCY_LIST = "adjacency list"
+    DENSE = "dense"
+    LAZY = "lazy"
+
+
+class CostMode(Enum):
+    DECIMAL = "decimal"
+    FIXED_POINT = "fixed point"
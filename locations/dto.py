@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """
+    Bounds the location history kept per object, relative to its latest location.
+    max_history_size: ring buffer size, oldest locations are dropped first.
+    history_window: locations older than this are dropped.
+    downsample_after / downsample_interval: locations older than downsample_after
+    are thinned to at most one per downsample_interval.
+    None disables a bound; the latest location is always kept.
+    """
+
+    max_history_size: Optional[int] = None
+    history_window: Optional[timedelta] = None
+    downsample_after: Optional[timedelta] = None
+    downsample_interval: Optional[timedelta] = None
+
+    def __post_init__(self):
+        if self.max_history_size is not None and self.max_history_size < 1:
+            raise Exception("max_history_size must be at least 1")
+        if (self.downsample_after is None) != (self.downsample_interval is None):
+            raise Exception(
+                "downsample_after and downsample_interval must be set together"
+            )
@@ -0,0 +1,174 @@
+import heapq
+import itertools
+import math
+import threading
+import uuid
+from typing import Dict, Tuple, Set, List, Optional, Callable, Iterator
+
+from graphs.calculator import DistanceCalculatorFactory, DistanceCalculator
+from graphs.enums import DistanceCalculationStrategy
+from locations.model import Location
+
+Cell = Tuple[int, int]
+
+
+class RiderLocationIndex:
+    """
+    Uniform latitude / longitude grid over the latest location of every rider,
+    kept up to date by LocationService.create on rider pings.
+    get_nearest scans cells in rings around the query and stops once no unscanned
+    cell can hold a closer rider, so a query only looks at riders near the point.
+    When the ring would cover more cells than are occupied, the remaining occupied
+    cells are scanned directly.
+    """
+
+    CELL_SIZE_DEGREES = 0.01
+    KM_PER_DEGREE = 111.19
+    LONGITUDE_CELLS = math.ceil(360 / CELL_SIZE_DEGREES)
+
+    _rider_id_to_location_map: Dict[uuid.UUID, Location] = {}
+    _rider_id_to_cell_map: Dict[uuid.UUID, Cell] = {}
+    _cell_to_rider_ids_map: Dict[Cell, Set[uuid.UUID]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def update(cls, location: Location):
+        rider_id: uuid.UUID = location.object_id
+        with cls._lock:
+            current: Optional[Location] = cls._rider_id_to_location_map.get(rider_id)
+            if current is not None and current.timestamp > location.timestamp:
+                return
+
+            cell: Cell = cls._get_cell(location)
+            old_cell: Optional[Cell] = cls._rider_id_to_cell_map.get(rider_id)
+            if old_cell != cell:
+                if old_cell is not None:
+                    cls._discard(old_cell, rider_id)
+                cls._cell_to_rider_ids_map.setdefault(cell, set()).add(rider_id)
+                cls._rider_id_to_cell_map[rider_id] = cell
+            cls._rider_id_to_location_map[rider_id] = location
+
+    @classmethod
+    def remove(cls, rider_id: uuid.UUID):
+        with cls._lock:
+            cell: Optional[Cell] = cls._rider_id_to_cell_map.pop(rider_id, None)
+            if cell is not None:
+                cls._discard(cell, rider_id)
+            cls._rider_id_to_location_map.pop(rider_id, None)
+
+    @classmethod
+    def get_location(cls, rider_id: uuid.UUID) -> Optional[Location]:
+        return cls._rider_id_to_location_map.get(rider_id)
+
+    @classmethod
+    def get_nearest(
+        cls,
+        location: Location,
+        k: int,
+        is_available: Optional[Callable[[uuid.UUID], bool]] = None,
+    ) -> List[Tuple[uuid.UUID, float]]:
+        """
+        Up to k (rider_id, distance in km) pairs closest to location, nearest
+        first, skipping riders for which is_available returns False.
+        """
+        calculator: DistanceCalculator = DistanceCalculatorFactory.get_calculator(
+            DistanceCalculationStrategy.HAVERSINE
+        )
+        # max heap of the k best as (-distance, rider_id)
+        best: List[Tuple[float, uuid.UUID]] = []
+
+        def evaluate(rider_ids: Set[uuid.UUID]):
+            for rider_id in rider_ids:
+                if is_available is not None and not is_available(rider_id):
+                    continue
+                distance: float = calculator.calculate_float(
+                    location, cls._rider_id_to_location_map[rider_id]
+                )
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, rider_id))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, rider_id))
+
+        with cls._lock:
+            if k <= 0 or not cls._cell_to_rider_ids_map:
+                return []
+
+            row, column = cls._get_cell(location)
+            for ring in itertools.count():
+                if (2 * ring + 1) ** 2 > len(cls._cell_to_rider_ids_map):
+                    for cell, rider_ids in cls._cell_to_rider_ids_map.items():
+                        if cls._get_ring(row, column, cell) >= ring:
+                            evaluate(rider_ids)
+                    break
+
+                for cell in cls._get_ring_cells(row, column, ring):
+                    evaluate(cls._cell_to_rider_ids_map.get(cell, set()))
+                if len(best) == k and -best[0][0] <= cls._get_ring_distance(
+                    location, ring + 1
+                ):
+                    break
+
+        return [
+            (rider_id, -distance) for distance, rider_id in sorted(best, reverse=True)
+        ]
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._rider_id_to_location_map.clear()
+            cls._rider_id_to_cell_map.clear()
+            cls._cell_to_rider_ids_map.clear()
+
+    @classmethod
+    def _discard(cls, cell: Cell, rider_id: uuid.UUID):
+        rider_ids: Set[uuid.UUID] = cls._cell_to_rider_ids_map[cell]
+        rider_ids.discard(rider_id)
+        if not rider_ids:
+            del cls._cell_to_rider_ids_map[cell]
+
+    @classmethod
+    def _get_cell(cls, location: Location) -> Cell:
+        return (
+            math.floor((float(location.latitude) + 90) / cls.CELL_SIZE_DEGREES),
+            math.floor((float(location.longitude) + 180) / cls.CELL_SIZE_DEGREES)
+            % cls.LONGITUDE_CELLS,
+        )
+
+    @classmethod
+    def _get_ring(cls, row: int, column: int, cell: Cell) -> int:
+        column_offset = abs(cell[1] - column) % cls.LONGITUDE_CELLS
+        return max(
+            abs(cell[0] - row), min(column_offset, cls.LONGITUDE_CELLS - column_offset)
+        )
+
+    @classmethod
+    def _get_ring_cells(cls, row: int, column: int, ring: int) -> Iterator[Cell]:
+        if ring == 0:
+            yield row, column
+            return
+
+        for row_offset in range(-ring, ring + 1):
+            column_offsets = (
+                range(-ring, ring + 1) if abs(row_offset) == ring else (-ring, ring)
+            )
+            for column_offset in column_offsets:
+                yield row + row_offset, (column + column_offset) % cls.LONGITUDE_CELLS
+
+    @classmethod
+    def _get_ring_distance(cls, location: Location, ring: int) -> float:
+        """
+        Lower bound in km on the distance from location to any rider in ring.
+        Along a parallel a degree shrinks by cos(latitude), taken at the most polar
+        latitude the ring reaches; 2 / pi covers great circles vs parallels.
+        """
+        latitude: float = min(
+            90.0, abs(float(location.latitude)) + (ring + 1) * cls.CELL_SIZE_DEGREES
+        )
+        return (
+            max(ring - 1, 0)
+            * cls.CELL_SIZE_DEGREES
+            * cls.KM_PER_DEGREE
+            * math.cos(math.radians(latitude))
+            * 2
+            / math.pi
+        )
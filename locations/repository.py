@@ -1,19 +1,43 @@
 import uuid
-from typing import List
+from collections import deque
+from typing import List, Optional, Deque, Dict
+from locations.dto import RetentionPolicy
+from locations.enums import LocationType
 from locations.model import Location
 
 
 class LocationRepository:
+    """
+    Keeps a pointer to the latest location of every object, updated on insert.
+    The history of an object is a full resolution deque of recent locations plus
+    a deque of downsampled older ones, both trimmed from the oldest end on insert
+    according to the RetentionPolicy of its location type (unbounded by default).
+    A changed policy applies to an object on its next insert.
+    """
+
     _location_id_to_location_map = {}
-    _object_id_to_location_map = {}
+    _object_id_to_location_map: Dict[uuid.UUID, Deque[Location]] = {}
+    _object_id_to_downsampled_locations_map: Dict[uuid.UUID, Deque[Location]] = {}
+    _object_id_to_latest_location_map: Dict[uuid.UUID, Location] = {}
+    _location_type_to_retention_policy_map: Dict[LocationType, RetentionPolicy] = {}
+    _default_retention_policy: Optional[RetentionPolicy] = None
 
     @classmethod
     def insert_one(cls, location: Location) -> Location:
         if location.id not in cls._location_id_to_location_map:
             cls._location_id_to_location_map[location.id] = location
             if location.object_id not in cls._object_id_to_location_map:
-                cls._object_id_to_location_map[location.object_id] = []
+                cls._object_id_to_location_map[location.object_id] = deque()
+                cls._object_id_to_downsampled_locations_map[location.object_id] = (
+                    deque()
+                )
             cls._object_id_to_location_map[location.object_id].append(location)
+            latest: Optional[Location] = cls._object_id_to_latest_location_map.get(
+                location.object_id
+            )
+            if latest is None or location.timestamp > latest.timestamp:
+                cls._object_id_to_latest_location_map[location.object_id] = location
+            cls._apply_retention(location.object_id, location.location_type)
         else:
             raise Exception("Location id already exists")
         return location
@@ -26,10 +50,100 @@ class LocationRepository:
 
     @classmethod
     def get_by_object_id(cls, object_id: uuid.UUID) -> List[Location]:
-        return cls._object_id_to_location_map.get(object_id, [])
+        return list(
+            cls._object_id_to_downsampled_locations_map.get(object_id, [])
+        ) + list(cls._object_id_to_location_map.get(object_id, []))
+
+    @classmethod
+    def get_latest_by_object_id(cls, object_id: uuid.UUID) -> Optional[Location]:
+        return cls._object_id_to_latest_location_map.get(object_id)
 
     @classmethod
     def update(cls, location: Location):
         if location.id not in cls._location_id_to_location_map:
             raise Exception("Location id does not exist")
         cls._location_id_to_location_map[location.id] = location
+        for locations in (
+            cls._object_id_to_downsampled_locations_map.get(location.object_id, []),
+            cls._object_id_to_location_map.get(location.object_id, []),
+        ):
+            for index, existing in enumerate(locations):
+                if existing.id == location.id:
+                    locations[index] = location
+
+        latest: Optional[Location] = cls._object_id_to_latest_location_map.get(
+            location.object_id
+        )
+        if latest is None or latest.id == location.id:
+            cls._object_id_to_latest_location_map[location.object_id] = max(
+                [location] + cls.get_by_object_id(location.object_id),
+                key=lambda loc: loc.timestamp,
+            )
+        elif location.timestamp > latest.timestamp:
+            cls._object_id_to_latest_location_map[location.object_id] = location
+
+    @classmethod
+    def set_retention_policy(
+        cls,
+        policy: Optional[RetentionPolicy],
+        location_type: Optional[LocationType] = None,
+    ):
+        """
+        Policy for objects of location_type, or the default for all types when
+        location_type is None. A None policy removes the bound.
+        """
+        if location_type is None:
+            cls._default_retention_policy = policy
+        elif policy is None:
+            cls._location_type_to_retention_policy_map.pop(location_type, None)
+        else:
+            cls._location_type_to_retention_policy_map[location_type] = policy
+
+    @classmethod
+    def _apply_retention(cls, object_id: uuid.UUID, location_type: LocationType):
+        policy: Optional[RetentionPolicy] = (
+            cls._location_type_to_retention_policy_map.get(
+                location_type, cls._default_retention_policy
+            )
+        )
+        if policy is None:
+            return
+
+        recent: Deque[Location] = cls._object_id_to_location_map[object_id]
+        downsampled: Deque[Location] = cls._object_id_to_downsampled_locations_map[
+            object_id
+        ]
+        latest_timestamp = cls._object_id_to_latest_location_map[object_id].timestamp
+        if policy.downsample_after is not None:
+            cutoff = latest_timestamp - policy.downsample_after
+            while recent and recent[0].timestamp < cutoff:
+                location: Location = recent.popleft()
+                if (
+                    not downsampled
+                    or location.timestamp - downsampled[-1].timestamp
+                    >= policy.downsample_interval
+                ):
+                    downsampled.append(location)
+                else:
+                    cls._evict(location)
+
+        if policy.history_window is not None:
+            cutoff = latest_timestamp - policy.history_window
+            for locations in (downsampled, recent):
+                while locations and locations[0].timestamp < cutoff:
+                    cls._evict(locations.popleft())
+
+        if policy.max_history_size is not None:
+            while len(downsampled) + len(recent) > policy.max_history_size:
+                cls._evict((downsampled or recent).popleft())
+
+    @classmethod
+    def _evict(cls, location: Location):
+        """
+        Drops an evicted history location, except the latest one of its object.
+        """
+        if (
+            cls._object_id_to_latest_location_map.get(location.object_id)
+            is not location
+        ):
+            cls._location_id_to_location_map.pop(location.id, None)
@@ -1,9 +1,11 @@
 import uuid
 from datetime import datetime
 from decimal import Decimal
-from typing import List
+from typing import List, Optional
 
+from locations.dto import RetentionPolicy
 from locations.enums import LocationType
+from locations.index import RiderLocationIndex
 from locations.model import Location
 from locations.repository import LocationRepository
 
@@ -24,6 +26,8 @@ class LocationService:
         location.set_longitude(longitude)
         location.set_latitude(latitude)
         LocationRepository.insert_one(location)
+        if location_type == LocationType.RIDER:
+            RiderLocationIndex.update(location)
         return location
 
     @classmethod
@@ -36,7 +40,17 @@ class LocationService:
 
     @classmethod
     def get_latest_by_object_id(cls, object_id: uuid.UUID) -> Location:
-        locations = LocationRepository.get_by_object_id(object_id)
-        if not locations:
+        location: Optional[Location] = LocationRepository.get_latest_by_object_id(
+            object_id
+        )
+        if location is None:
             raise Exception("No locations found for the given object id")
-        return max(locations, key=lambda loc: loc.timestamp)
+        return location
+
+    @classmethod
+    def set_retention_policy(
+        cls,
+        policy: Optional[RetentionPolicy],
+        location_type: Optional[LocationType] = None,
+    ):
+        LocationRepository.set_retention_policy(policy, location_type)
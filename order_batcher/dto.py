@@ -0,0 +1,35 @@
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Tuple
+
+from locations.model import Location
+from orders.model import Order
+
+
+@dataclass
+class OrderBatch:
+    """
+    Open batch of orders. stops is the estimated visiting order as
+    (order_id, location) pairs, each restaurant before its customer;
+    ready times are placed_at + restaurant prep time of the orders.
+    """
+
+    id: uuid.UUID
+    orders: List[Order] = field(default_factory=list)
+    stops: List[Tuple[uuid.UUID, Location]] = field(default_factory=list)
+    earliest_ready_at: datetime = None
+    latest_ready_at: datetime = None
+    estimated_distance_km: float = 0.0
+
+    def size(self) -> int:
+        return len(self.orders)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "order_ids": [order.id for order in self.orders],
+            "earliest_ready_at": self.earliest_ready_at,
+            "latest_ready_at": self.latest_ready_at,
+            "estimated_distance_km": self.estimated_distance_km,
+        }
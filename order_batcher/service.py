@@ -0,0 +1,310 @@
+import math
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from graphs.calculator import DistanceCalculatorFactory, DistanceCalculator
+from graphs.enums import DistanceCalculationStrategy
+from locations.model import Location
+from locations.service import LocationService
+from order_batcher.dto import OrderBatch
+from orders.enums import OrderStatus
+from orders.model import Order
+from restaurants.service import RestaurantService
+
+Cell = Tuple[int, int]
+
+
+class OrderBatcher:
+    """
+    Groups pending orders into batches of at most max_batch_size orders, one
+    order at a time as they arrive.
+    A new order is only compared with open batches that have a restaurant in the
+    3 x 3 grid cells around its restaurant (at most MAX_CANDIDATE_BATCHES) and
+    whose ready times stay within MAX_READY_GAP_MINUTES of its own. Candidates are
+    scored by the cheapest insertion of its pickup and drop-off into the batch's
+    estimated stop sequence, no route search. The order joins the cheapest batch
+    when that adds at most its own pickup -> drop-off distance plus
+    MAX_APPROACH_KM, the approach a separate rider would drive; otherwise it
+    opens a new batch.
+    OrderService.create queues new orders through enqueue_order and
+    OrderService.update_status drops orders that leave PENDING, so
+    batch_pending_orders only touches the orders that arrived since its last run.
+    The queue holds at most MAX_QUEUED_ORDERS orders: a full queue is batched on
+    the spot with the max_batch_size of the last batch_pending_orders run.
+    """
+
+    DEFAULT_MAX_BATCH_SIZE = 3
+    CELL_SIZE_DEGREES = 0.02
+    MAX_CANDIDATE_BATCHES = 16
+    MAX_READY_GAP_MINUTES = 10
+    MAX_APPROACH_KM = 2.0
+    MAX_QUEUED_ORDERS = 256
+
+    _batch_id_to_batch_map: Dict[uuid.UUID, OrderBatch] = {}
+    _order_id_to_batch_id_map: Dict[uuid.UUID, uuid.UUID] = {}
+    _cell_to_batch_ids_map: Dict[Cell, Set[uuid.UUID]] = {}
+    _new_orders: Deque[Order] = deque()
+    _max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+    _lock = threading.RLock()
+
+    @classmethod
+    def enqueue_order(cls, order: Order):
+        """
+        Queues a new order for the next batch_pending_orders run, batching the
+        queue right away once it reaches MAX_QUEUED_ORDERS.
+        """
+        with cls._lock:
+            cls._new_orders.append(order)
+            if len(cls._new_orders) >= cls.MAX_QUEUED_ORDERS:
+                cls._add_new_orders(cls._max_batch_size)
+
+    @classmethod
+    def add_order(
+        cls, order: Order, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+    ) -> OrderBatch:
+        restaurant: Location = LocationService.get_latest_by_object_id(
+            order.restaurant_id
+        )
+        customer: Location = LocationService.get_latest_by_object_id(order.customer_id)
+        ready_at: datetime = cls._get_ready_at(order)
+        with cls._lock:
+            if order.id in cls._order_id_to_batch_id_map:
+                return cls._batch_id_to_batch_map[
+                    cls._order_id_to_batch_id_map[order.id]
+                ]
+
+            best: Optional[Tuple[float, OrderBatch, int, int]] = None
+            for batch in cls._get_candidate_batches(
+                restaurant, ready_at, max_batch_size
+            ):
+                cost, pickup_position, drop_position = cls._get_insertion(
+                    batch.stops, restaurant, customer
+                )
+                if best is None or cost < best[0]:
+                    best = (cost, batch, pickup_position, drop_position)
+
+            own_distance: float = cls._get_distance(restaurant, customer)
+            if best is None or best[0] > own_distance + cls.MAX_APPROACH_KM:
+                batch = OrderBatch(uuid.uuid4())
+                cost, pickup_position, drop_position = own_distance, 0, 0
+                cls._batch_id_to_batch_map[batch.id] = batch
+            else:
+                cost, batch, pickup_position, drop_position = best
+                cls._unregister(batch)
+
+            batch.stops.insert(drop_position, (order.id, customer))
+            batch.stops.insert(pickup_position, (order.id, restaurant))
+            batch.orders.append(order)
+            batch.estimated_distance_km += cost
+            batch.earliest_ready_at = min(batch.earliest_ready_at or ready_at, ready_at)
+            batch.latest_ready_at = max(batch.latest_ready_at or ready_at, ready_at)
+            cls._order_id_to_batch_id_map[order.id] = batch.id
+            cls._register(batch)
+            return batch
+
+    @classmethod
+    def remove_order(cls, order_id: uuid.UUID):
+        """
+        Drops a cancelled or dispatched order, keeping the other stops in order.
+        """
+        with cls._lock:
+            batch_id: Optional[uuid.UUID] = cls._order_id_to_batch_id_map.pop(
+                order_id, None
+            )
+            if batch_id is None:
+                return
+
+            batch: OrderBatch = cls._batch_id_to_batch_map[batch_id]
+            cls._unregister(batch)
+            batch.orders = [order for order in batch.orders if order.id != order_id]
+            if not batch.orders:
+                del cls._batch_id_to_batch_map[batch_id]
+                return
+
+            batch.stops = [stop for stop in batch.stops if stop[0] != order_id]
+            ready_times: List[datetime] = [
+                cls._get_ready_at(order) for order in batch.orders
+            ]
+            batch.earliest_ready_at = min(ready_times)
+            batch.latest_ready_at = max(ready_times)
+            batch.estimated_distance_km = sum(
+                cls._get_distance(batch.stops[index][1], batch.stops[index + 1][1])
+                for index in range(len(batch.stops) - 1)
+            )
+            cls._register(batch)
+
+    @classmethod
+    def batch_pending_orders(
+        cls, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+    ) -> List[OrderBatch]:
+        """
+        Batches the orders queued since the last run, in arrival order, skipping
+        those that already left PENDING. Existing batches are kept.
+        """
+        with cls._lock:
+            cls._max_batch_size = max_batch_size
+            cls._add_new_orders(max_batch_size)
+            return cls.get_batches()
+
+    @classmethod
+    def get_batches(cls) -> List[OrderBatch]:
+        return list(cls._batch_id_to_batch_map.values())
+
+    @classmethod
+    def release_batch(cls, batch_id: uuid.UUID) -> OrderBatch:
+        """
+        Removes a batch handed over to a rider.
+        """
+        with cls._lock:
+            batch: Optional[OrderBatch] = cls._batch_id_to_batch_map.pop(batch_id, None)
+            if batch is None:
+                raise Exception("Batch id does not exist")
+
+            cls._unregister(batch)
+            for order in batch.orders:
+                cls._order_id_to_batch_id_map.pop(order.id, None)
+            return batch
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._batch_id_to_batch_map.clear()
+            cls._order_id_to_batch_id_map.clear()
+            cls._cell_to_batch_ids_map.clear()
+            cls._new_orders.clear()
+            cls._max_batch_size = cls.DEFAULT_MAX_BATCH_SIZE
+
+    @classmethod
+    def _add_new_orders(cls, max_batch_size: int):
+        while cls._new_orders:
+            order: Order = cls._new_orders.popleft()
+            if order.status == OrderStatus.PENDING:
+                cls.add_order(order, max_batch_size)
+
+    @classmethod
+    def _get_candidate_batches(
+        cls, restaurant: Location, ready_at: datetime, max_batch_size: int
+    ) -> List[OrderBatch]:
+        max_gap = timedelta(minutes=cls.MAX_READY_GAP_MINUTES)
+        row, column = cls._get_cell(restaurant)
+        candidates: List[OrderBatch] = []
+        seen: Set[uuid.UUID] = set()
+        for row_offset in (-1, 0, 1):
+            for column_offset in (-1, 0, 1):
+                cell: Cell = (row + row_offset, column + column_offset)
+                for batch_id in cls._cell_to_batch_ids_map.get(cell, set()):
+                    if batch_id in seen:
+                        continue
+                    seen.add(batch_id)
+                    batch: OrderBatch = cls._batch_id_to_batch_map[batch_id]
+                    if (
+                        batch.size() < max_batch_size
+                        and max(batch.latest_ready_at, ready_at)
+                        - min(batch.earliest_ready_at, ready_at)
+                        <= max_gap
+                    ):
+                        candidates.append(batch)
+                        if len(candidates) == cls.MAX_CANDIDATE_BATCHES:
+                            return candidates
+
+        return candidates
+
+    @classmethod
+    def _get_insertion(
+        cls,
+        stops: List[Tuple[uuid.UUID, Location]],
+        pickup: Location,
+        drop: Location,
+    ) -> Tuple[float, int, int]:
+        """
+        Cheapest (added km, pickup position, drop position) for inserting pickup
+        then drop into the open path of stops; positions index the original stops.
+        """
+        locations: List[Location] = [location for _, location in stops]
+        size = len(locations)
+
+        def detour(location: Location, position: int) -> float:
+            cost = 0.0
+            if position > 0:
+                cost += cls._get_distance(locations[position - 1], location)
+            if position < size:
+                cost += cls._get_distance(location, locations[position])
+            if 0 < position < size:
+                cost -= cls._get_distance(locations[position - 1], locations[position])
+            return cost
+
+        pickup_detours: List[float] = [
+            detour(pickup, position) for position in range(size + 1)
+        ]
+        drop_detours: List[float] = [
+            detour(drop, position) for position in range(size + 1)
+        ]
+        own_distance: float = cls._get_distance(pickup, drop)
+
+        best: Tuple[float, int, int] = (math.inf, 0, 0)
+        for position in range(size + 1):
+            # pickup and drop next to each other
+            cost = own_distance
+            if position > 0:
+                cost += cls._get_distance(locations[position - 1], pickup)
+            if position < size:
+                cost += cls._get_distance(drop, locations[position])
+            if 0 < position < size:
+                cost -= cls._get_distance(locations[position - 1], locations[position])
+            if cost < best[0]:
+                best = (cost, position, position)
+
+        best_pickup_position = 0
+        for drop_position in range(1, size + 1):
+            if pickup_detours[drop_position - 1] < pickup_detours[best_pickup_position]:
+                best_pickup_position = drop_position - 1
+            cost = pickup_detours[best_pickup_position] + drop_detours[drop_position]
+            if cost < best[0]:
+                best = (cost, best_pickup_position, drop_position)
+
+        return best
+
+    @classmethod
+    def _get_ready_at(cls, order: Order) -> datetime:
+        preparation_time = RestaurantService.get_by_id(
+            order.restaurant_id
+        ).avg_preparation_time
+        return order.placed_at + timedelta(minutes=float(preparation_time))
+
+    @classmethod
+    def _get_distance(cls, location1: Location, location2: Location) -> float:
+        calculator: DistanceCalculator = DistanceCalculatorFactory.get_calculator(
+            DistanceCalculationStrategy.HAVERSINE
+        )
+        return calculator.calculate_float(location1, location2)
+
+    @classmethod
+    def _get_cell(cls, location: Location) -> Cell:
+        return (
+            math.floor(float(location.latitude) / cls.CELL_SIZE_DEGREES),
+            math.floor(float(location.longitude) / cls.CELL_SIZE_DEGREES),
+        )
+
+    @classmethod
+    def _get_restaurant_cells(cls, batch: OrderBatch) -> Set[Cell]:
+        return {
+            cls._get_cell(location)
+            for _, location in batch.stops
+            if location.is_restaurant()
+        }
+
+    @classmethod
+    def _register(cls, batch: OrderBatch):
+        for cell in cls._get_restaurant_cells(batch):
+            cls._cell_to_batch_ids_map.setdefault(cell, set()).add(batch.id)
+
+    @classmethod
+    def _unregister(cls, batch: OrderBatch):
+        for cell in cls._get_restaurant_cells(batch):
+            batch_ids: Set[uuid.UUID] = cls._cell_to_batch_ids_map.get(cell, set())
+            batch_ids.discard(batch.id)
+            if not batch_ids:
+                cls._cell_to_batch_ids_map.pop(cell, None)
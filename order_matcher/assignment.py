@@ -0,0 +1,90 @@
+import math
+from typing import List, Optional
+
+
+class HungarianAssignmentSolver:
+    """
+    Minimum cost assignment of rows to distinct columns (Kuhn-Munkres with
+    potentials, O(rows^2 * columns)). math.inf marks a forbidden cell; such cells
+    are priced above any feasible assignment, so as many rows as possible are
+    assigned first and the total cost is minimized among those.
+    """
+
+    @classmethod
+    def solve(cls, cost_matrix: List[List[float]]) -> List[Optional[int]]:
+        """
+        Column assigned to each row, None when the row gets no allowed column.
+        """
+        rows = len(cost_matrix)
+        columns = len(cost_matrix[0]) if rows else 0
+        finite_costs: List[float] = [
+            cost for row in cost_matrix for cost in row if cost != math.inf
+        ]
+        if not finite_costs:
+            return [None] * rows
+
+        if rows > columns:
+            transposed: List[List[float]] = [
+                list(column) for column in zip(*cost_matrix)
+            ]
+            assignment: List[Optional[int]] = [None] * rows
+            for column, row in enumerate(cls.solve(transposed)):
+                if row is not None:
+                    assignment[row] = column
+            return assignment
+
+        forbidden_cost: float = (max(finite_costs) + 1) * (rows + 1)
+        costs: List[List[float]] = [
+            [forbidden_cost if cost == math.inf else cost for cost in row]
+            for row in cost_matrix
+        ]
+
+        # 1 indexed potentials; owners[j] is the row matched to column j, 0 if none
+        row_potentials: List[float] = [0.0] * (rows + 1)
+        column_potentials: List[float] = [0.0] * (columns + 1)
+        owners: List[int] = [0] * (columns + 1)
+        previous_columns: List[int] = [0] * (columns + 1)
+        for row in range(1, rows + 1):
+            owners[0] = row
+            column = 0
+            min_slacks: List[float] = [math.inf] * (columns + 1)
+            used: List[bool] = [False] * (columns + 1)
+            while owners[column]:
+                used[column] = True
+                owner = owners[column]
+                delta = math.inf
+                next_column = 0
+                for candidate in range(1, columns + 1):
+                    if used[candidate]:
+                        continue
+                    slack = (
+                        costs[owner - 1][candidate - 1]
+                        - row_potentials[owner]
+                        - column_potentials[candidate]
+                    )
+                    if slack < min_slacks[candidate]:
+                        min_slacks[candidate] = slack
+                        previous_columns[candidate] = column
+                    if min_slacks[candidate] < delta:
+                        delta = min_slacks[candidate]
+                        next_column = candidate
+                for candidate in range(columns + 1):
+                    if used[candidate]:
+                        row_potentials[owners[candidate]] += delta
+                        column_potentials[candidate] -= delta
+                    else:
+                        min_slacks[candidate] -= delta
+                column = next_column
+
+            while column:
+                previous_column = previous_columns[column]
+                owners[column] = owners[previous_column]
+                column = previous_column
+
+        assignment = [None] * rows
+        for column in range(1, columns + 1):
+            row = owners[column]
+            if row and cost_matrix[row - 1][column - 1] != math.inf:
+                assignment[row - 1] = column - 1
+
+        return assignment
@@ -1,20 +1,184 @@
+import math
+import multiprocessing
 import uuid
-from typing import List, Set
+from decimal import Decimal
+from typing import List, Set, Dict, Tuple, Optional
 
+from graphs.builder import GraphBuilder
+from graphs.dto import Graph
+from locations.index import RiderLocationIndex
 from locations.model import Location
 from locations.service import LocationService
+from order_matcher.assignment import HungarianAssignmentSolver
+from route_finder.dto import RouteDTO
+from route_finder.enums import RoutePlanningStrategy
+from route_finder.service import RouteFinderFactory, RouteFinder
 from users.model import Rider
 from users.service import RiderService
 from orders.model import Order
 
+# (batches, strategy) of the match_many call a pool worker process serves
+_worker_context: Optional[Tuple[List[List[Order]], RoutePlanningStrategy]] = None
+
 
 class OrderMatcher:
+    DEFAULT_CANDIDATE_RIDERS = 10
+    DEFAULT_MAX_PICKUP_DISTANCE_KM = 10.0
+    DEFAULT_MAX_WORKERS = 8
+    MIN_PARALLEL_CELLS = 16
+    # finders that start their own process pool, which pool workers cannot do
+    _UNSUPPORTED_STRATEGIES = {RoutePlanningStrategy.PARALLEL_ALL_POSSIBLE_PATHS}
+
     @classmethod
     def match(cls, orders: List[Order]) -> Rider:
-        active_riders = RiderService.get_active_riders()
-        if not active_riders:
+        nearest_riders: List[Rider] = cls.get_nearest_riders(orders, 1)
+        if not nearest_riders:
             raise Exception("No active riders available")
-        return active_riders[0]
+        return nearest_riders[0]
+
+    @classmethod
+    def get_nearest_riders(cls, orders: List[Order], k: int) -> List[Rider]:
+        """
+        Up to k active riders nearest to the batch, a rider's distance being the
+        one to the closest restaurant of the batch (RiderLocationIndex).
+        """
+        distances: Dict[uuid.UUID, float] = cls._get_rider_distances(orders, k)
+        return [RiderService.get_by_id(rider_id) for rider_id in distances]
+
+    @classmethod
+    def match_many(
+        cls,
+        batches: List[List[Order]],
+        strategy: RoutePlanningStrategy = RoutePlanningStrategy.A_STAR_WITH_MASK,
+        candidate_riders: int = DEFAULT_CANDIDATE_RIDERS,
+        max_pickup_distance_km: float = DEFAULT_MAX_PICKUP_DISTANCE_KM,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> List[Optional[Rider]]:
+        """
+        Assigns batches to distinct riders, minimizing the total route cost.
+        A (rider, batch) cell costs the route over the batch starting at the rider,
+        i.e. the pickup ETA plus the delivery route. Only the candidate_riders
+        nearest riders within max_pickup_distance_km of a batch's restaurants get a
+        cell and the matrix is solved by HungarianAssignmentSolver.
+        Graph building and search are pure Python, so cells are evaluated on a pool
+        of max_workers forked processes, which inherit the in memory repositories.
+        Below MIN_PARALLEL_CELLS cells, with max_workers <= 1 or where fork is not
+        available, they are evaluated sequentially in process.
+        Returns the rider of each batch, None when no candidate is left for it.
+        """
+        if strategy in cls._UNSUPPORTED_STRATEGIES:
+            raise Exception(f"{strategy.value} is not supported by match_many")
+
+        candidates: List[List[uuid.UUID]] = [
+            [
+                rider_id
+                for rider_id, distance in cls._get_rider_distances(
+                    batch, candidate_riders
+                ).items()
+                if distance <= max_pickup_distance_km
+            ]
+            for batch in batches
+        ]
+        rider_ids: List[uuid.UUID] = list(
+            dict.fromkeys(rider_id for batch in candidates for rider_id in batch)
+        )
+        column_map: Dict[uuid.UUID, int] = {
+            rider_id: column for column, rider_id in enumerate(rider_ids)
+        }
+        cells: List[Tuple[int, uuid.UUID]] = [
+            (row, rider_id)
+            for row, batch_candidates in enumerate(candidates)
+            for rider_id in batch_candidates
+        ]
+        cost_matrix: List[List[float]] = [[math.inf] * len(rider_ids) for _ in batches]
+        if (
+            max_workers > 1
+            and len(cells) >= cls.MIN_PARALLEL_CELLS
+            and "fork" in multiprocessing.get_all_start_methods()
+        ):
+            # fork passes initargs by inheritance, Orders hold locks and cannot be pickled
+            with multiprocessing.get_context("fork").Pool(
+                min(max_workers, len(cells)),
+                initializer=cls._init_worker,
+                initargs=(batches, strategy),
+            ) as pool:
+                costs: List[Optional[Decimal]] = pool.map(cls._get_worker_cost, cells)
+        else:
+            route_finder: RouteFinder = RouteFinderFactory.get_route_finder(strategy)
+            costs = [
+                cls._get_route_cost(route_finder, rider_id, batches[row])
+                for row, rider_id in cells
+            ]
+
+        for (row, rider_id), cost in zip(cells, costs):
+            if cost is not None:
+                cost_matrix[row][column_map[rider_id]] = float(cost)
+
+        assignment: List[Optional[int]] = HungarianAssignmentSolver.solve(cost_matrix)
+        return [
+            None if column is None else RiderService.get_by_id(rider_ids[column])
+            for column in assignment
+        ]
+
+    @classmethod
+    def get_customer_restaurant_map(
+        cls, orders: List[Order]
+    ) -> Dict[uuid.UUID, List[uuid.UUID]]:
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]] = {}
+        for order in orders:
+            customer_restaurant_map.setdefault(order.customer_id, []).append(
+                order.restaurant_id
+            )
+
+        return customer_restaurant_map
+
+    @classmethod
+    def _get_rider_distances(
+        cls, orders: List[Order], k: int
+    ) -> Dict[uuid.UUID, float]:
+        """
+        The k active riders nearest to the batch, mapped to their distance in km
+        to the closest restaurant of the batch.
+        """
+        distances: Dict[uuid.UUID, float] = {}
+        for restaurant_id in {order.restaurant_id for order in orders}:
+            location: Location = LocationService.get_latest_by_object_id(restaurant_id)
+            nearest: List[Tuple[uuid.UUID, float]] = RiderLocationIndex.get_nearest(
+                location, k, RiderService.is_active
+            )
+            for rider_id, distance in nearest:
+                distances[rider_id] = min(distance, distances.get(rider_id, distance))
+
+        return {
+            rider_id: distances[rider_id]
+            for rider_id in sorted(distances, key=distances.get)[:k]
+        }
+
+    @classmethod
+    def _init_worker(cls, batches: List[List[Order]], strategy: RoutePlanningStrategy):
+        global _worker_context
+        _worker_context = (batches, strategy)
+
+    @classmethod
+    def _get_worker_cost(cls, cell: Tuple[int, uuid.UUID]) -> Optional[Decimal]:
+        batches, strategy = _worker_context
+        row, rider_id = cell
+        return cls._get_route_cost(
+            RouteFinderFactory.get_route_finder(strategy), rider_id, batches[row]
+        )
+
+    @classmethod
+    def _get_route_cost(
+        cls, route_finder: RouteFinder, rider_id: uuid.UUID, orders: List[Order]
+    ) -> Optional[Decimal]:
+        rider: Rider = RiderService.get_by_id(rider_id)
+        locations: List[Location] = cls.get_locations(orders)
+        locations.append(LocationService.get_latest_by_object_id(rider_id))
+        graph: Graph = GraphBuilder.build(rider, locations)
+        route: Optional[RouteDTO] = route_finder.find(
+            graph, cls.get_customer_restaurant_map(orders)
+        )
+        return None if route is None else route.cost_till_here
 
     @classmethod
     def get_locations(cls, orders: List[Order]) -> List[Location]:
@@ -3,6 +3,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import List
 
+from order_batcher.service import OrderBatcher
 from orders.enums import OrderStatus
 from orders.model import Order
 from orders.repository import OrderRepository
@@ -20,6 +21,7 @@ class OrderService:
         order.set_placed_at(datetime.now())
         order.set_status(OrderStatus.PENDING)
         OrderRepository.insert_one(order)
+        OrderBatcher.enqueue_order(order)
         return order
 
     @classmethod
@@ -37,3 +39,12 @@ class OrderService:
     @classmethod
     def get_all(cls) -> List[Order]:
         return list(OrderRepository.get_all())
+
+    @classmethod
+    def update_status(cls, order_id: uuid.UUID, status: OrderStatus) -> Order:
+        order: Order = OrderRepository.get_by_id(order_id)
+        order.set_status(status)
+        OrderRepository.update(order)
+        if status != OrderStatus.PENDING:
+            OrderBatcher.remove_order(order_id)
+        return order
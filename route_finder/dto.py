@@ -1,10 +1,11 @@
 import json
+import uuid
 from abc import ABC
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, List, Tuple, Iterator, Any
 
-from graphs.dto import NodeDTO
+from graphs.dto import NodeDTO, Graph, Cost, LazyGraph
 
 
 class TraversalNode(ABC):
@@ -45,6 +46,23 @@ class DijkstraNode(TraversalNode):
         }
 
 
+@dataclass
+class SearchStats:
+    """
+    Counters filled in by a finder when passed to find.
+    """
+
+    states_pushed: int = 0
+    states_expanded: int = 0
+    pushes_avoided: int = 0
+    states_pruned: int = 0
+    lower_bound: Optional[Decimal] = None
+    optimality_gap: Optional[float] = None
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+
 @dataclass
 class RouteDTO:
     node: TraversalNode
@@ -65,3 +83,153 @@ class RouteDTO:
 
     def to_dict_without_previous(self):
         return {"node": self.node.to_dict(), "cost_till_here": self.cost_till_here}
+
+
+@dataclass
+class InsertionDTO:
+    """
+    Cheapest insertion of an order into a flattened route. The pickup goes right
+    after route[pickup_position] and the drop-off right after route[drop_position]
+    (after the pickup when both are equal). A position is None when that stop is
+    already on the route; marginal_cost is None when no insertion keeps the
+    restaurant before the customer.
+    """
+
+    order_id: uuid.UUID
+    pickup_position: Optional[int]
+    drop_position: Optional[int]
+    marginal_cost: Optional[Decimal]
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+
+class LazyWeights:
+    """
+    Flat weights table of a SearchSpace over a LazyGraph, read like a list.
+    An entry is computed through graph.get_weight the first time it is read;
+    transitions that no route can take (into the root, from the root into a
+    customer that needs a restaurant, from a customer into one of its own
+    restaurants) are None and never computed.
+    """
+
+    _MISSING = object()
+
+    def __init__(
+        self, graph: LazyGraph, nodes: List[NodeDTO], required_masks: List[int]
+    ):
+        # nodes are the stops followed by the root
+        self.graph = graph
+        self.nodes = nodes
+        self.required_masks = required_masks
+        self.row_size = len(nodes)
+        self.values: List[Any] = [self._MISSING] * (self.row_size**2)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[Optional[Cost]]:
+        return (self[position] for position in range(len(self.values)))
+
+    def __getitem__(self, position: int) -> Optional[Cost]:
+        value = self.values[position]
+        if value is self._MISSING:
+            from_index, to_index = divmod(position, self.row_size)
+            value = (
+                self.graph.get_weight(self.nodes[from_index], self.nodes[to_index])
+                if self._is_possible(from_index, to_index)
+                else None
+            )
+            self.values[position] = value
+
+        return value
+
+    def _is_possible(self, from_index: int, to_index: int) -> bool:
+        root_index = self.row_size - 1
+        if from_index == to_index or to_index == root_index:
+            return False
+        if from_index == root_index:
+            return not self.required_masks[to_index]
+        return not self.required_masks[from_index] & (1 << to_index)
+
+
+class SearchSpace:
+    """
+    Index based view of a graph for table driven finders.
+    Stops (customers + restaurants) get indices 0..size-1 and the root gets size,
+    weights are stored row major in a flat list of (size + 1) * (size + 1).
+    """
+
+    def __init__(
+        self,
+        graph: Graph,
+        nodes: List[NodeDTO],
+        weights: List[Optional[Cost]],
+        required_masks: List[int],
+        min_available_times: List[Cost],
+    ):
+        self.graph = graph
+        self.root = graph.root
+        self.nodes = nodes
+        self.size = len(nodes)
+        self.root_index = self.size
+        self.full_mask = (1 << self.size) - 1
+        self.weights = weights
+        self.required_masks = required_masks
+        self.min_available_times = min_available_times
+        self.restaurant_flags: List[bool] = [node.is_restaurant() for node in nodes]
+
+    def get_node(self, index: int) -> NodeDTO:
+        return self.root if index == self.root_index else self.nodes[index]
+
+    def weight(self, from_index: int, to_index: int) -> Optional[Cost]:
+        return self.weights[from_index * (self.size + 1) + to_index]
+
+    def evaluate(
+        self,
+        sequence: List[int],
+        start_index: Optional[int] = None,
+        start_mask: int = 0,
+        start_cost: Optional[Cost] = None,
+    ) -> Optional[Cost]:
+        """
+        Cost of visiting the stops in sequence order after start_index,
+        None if a customer comes before one of its restaurants.
+        """
+        index = self.root_index if start_index is None else start_index
+        mask = start_mask
+        cost = self.graph.zero_cost() if start_cost is None else start_cost
+        row_size = self.size + 1
+        for next_index in sequence:
+            required_mask = self.required_masks[next_index]
+            if mask & required_mask != required_mask:
+                return None
+            cost += self.weights[index * row_size + next_index]
+            if self.restaurant_flags[next_index]:
+                cost = max(self.min_available_times[next_index], cost)
+            mask |= 1 << next_index
+            index = next_index
+
+        return cost
+
+    def get_steps(
+        self,
+        sequence: List[int],
+        start_index: Optional[int] = None,
+        start_mask: int = 0,
+        start_cost: Optional[Cost] = None,
+    ) -> List[Tuple[int, Cost, int]]:
+        """
+        (node_index, cost, mask) for the start and every stop of the sequence.
+        """
+        index = self.root_index if start_index is None else start_index
+        mask = start_mask
+        cost = self.graph.zero_cost() if start_cost is None else start_cost
+        steps: List[Tuple[int, Cost, int]] = [(index, cost, mask)]
+        for next_index in sequence:
+            cost = self.evaluate([next_index], index, mask, cost)
+            mask |= 1 << next_index
+            index = next_index
+            steps.append((index, cost, mask))
+
+        return steps
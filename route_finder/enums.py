@@ -4,3 +4,16 @@ from enum import Enum
 class RoutePlanningStrategy(Enum):
     ALL_POSSIBLE_PATHS = "All Possible Paths"
     DIJKSTRA_WITH_MASK = "Dijkstra With Mask"
+    COMPACT_DIJKSTRA_WITH_MASK = "Compact Dijkstra With Mask"
+    A_STAR_WITH_MASK = "A* With Mask"
+    CHEAPEST_INSERTION_WITH_LOCAL_SEARCH = "Cheapest Insertion With Local Search"
+    BEAM_SEARCH = "Beam Search"
+    BRANCH_AND_BOUND = "Branch And Bound"
+    PARALLEL_ALL_POSSIBLE_PATHS = "Parallel All Possible Paths"
+    VECTORIZED_ALL_POSSIBLE_PATHS = "Vectorized All Possible Paths"
+    GEOGRAPHIC_DECOMPOSITION = "Geographic Decomposition"
+
+
+class PriorityQueueStrategy(Enum):
+    BINARY_HEAP = "Binary Heap"
+    BUCKET = "Bucket"
@@ -0,0 +1,209 @@
+import uuid
+from typing import List, Optional, Tuple
+
+from graphs.dto import NodeDTO, Graph, Cost
+from graphs.enums import DistanceCalculationStrategy
+from graphs.transformer import NodeTransformerFactory, NodeTransformer
+from locations.service import LocationService
+from orders.model import Order
+from route_finder.dto import RouteDTO, InsertionDTO
+
+
+class InsertionCostOracle:
+    """
+    Prices adding candidate orders to an existing route without a search.
+    For a route r_0 (root) .. r_L the prefix array holds the arrival time a_k at
+    every stop and the suffix array S_k the total wait at restaurants from r_k on.
+    A stop reached d later than before waits d less at its restaurant (never below
+    zero), so a delay d reaching r_k ends the route max(0, d - S_k) later. Every
+    (pickup, drop-off) position pair is priced in O(1) from these arrays, so a
+    candidate costs O(L^2).
+    """
+
+    @classmethod
+    def evaluate(
+        cls, graph: Graph, route: List[RouteDTO], orders: List[Order]
+    ) -> List[InsertionDTO]:
+        """
+        Cheapest insertion of each order into route, the flattened output of a
+        finder on graph (utils.flatten), in the order of orders.
+        """
+        if graph.weight_function is None:
+            raise Exception("Graph has no weight function")
+
+        nodes: List[NodeDTO] = [step.node.get_node() for step in route]
+        arrivals: List[Cost] = [graph.to_cost(route[0].cost_till_here)]
+        for index in range(1, len(nodes)):
+            arrivals.append(
+                cls._arrive(
+                    graph,
+                    nodes[index],
+                    arrivals[-1]
+                    + graph.weight_function(nodes[index - 1], nodes[index]),
+                )
+            )
+
+        # waits[k] = S_k, with S_{L + 1} = S_{L + 2} = 0 to avoid bound checks
+        waits: List[Cost] = [graph.zero_cost()] * (len(nodes) + 2)
+        for index in range(len(nodes) - 1, 0, -1):
+            waits[index] = (
+                waits[index + 1]
+                + arrivals[index]
+                - arrivals[index - 1]
+                - graph.weight_function(nodes[index - 1], nodes[index])
+            )
+
+        node_transformer: NodeTransformer = NodeTransformerFactory.get_transformer(
+            DistanceCalculationStrategy.HAVERSINE
+        )
+        insertions: List[InsertionDTO] = []
+        for order in orders:
+            pickup_index: Optional[int] = cls._find(nodes, order.restaurant_id)
+            drop_index: Optional[int] = cls._find(nodes, order.customer_id)
+            pickup: NodeDTO = (
+                nodes[pickup_index]
+                if pickup_index is not None
+                else node_transformer.transform_one(
+                    LocationService.get_latest_by_object_id(order.restaurant_id)
+                )
+            )
+            drop: NodeDTO = (
+                nodes[drop_index]
+                if drop_index is not None
+                else node_transformer.transform_one(
+                    LocationService.get_latest_by_object_id(order.customer_id)
+                )
+            )
+            delay, pickup_position, drop_position = cls._get_best_insertion(
+                graph, nodes, arrivals, waits, pickup, drop, pickup_index, drop_index
+            )
+            insertions.append(
+                InsertionDTO(
+                    order.id,
+                    pickup_position,
+                    drop_position,
+                    None if delay is None else graph.to_decimal(delay),
+                )
+            )
+
+        return insertions
+
+    @classmethod
+    def _get_best_insertion(
+        cls,
+        graph: Graph,
+        nodes: List[NodeDTO],
+        arrivals: List[Cost],
+        waits: List[Cost],
+        pickup: NodeDTO,
+        drop: NodeDTO,
+        pickup_index: Optional[int],
+        drop_index: Optional[int],
+    ) -> Tuple[Optional[Cost], Optional[int], Optional[int]]:
+        """
+        (delay of the route end, pickup position, drop position) of the cheapest
+        precedence feasible insertion, positions None for stops already on the route.
+        """
+        last = len(nodes) - 1
+        zero_cost: Cost = graph.zero_cost()
+        weight = graph.weight_function
+
+        def end_delay(index: int, arrival: Cost) -> Cost:
+            """
+            Route end delay when r_index is reached at arrival, r_index = end if past it.
+            """
+            if index > last:
+                return arrival - arrivals[last]
+            arrival = cls._arrive(graph, nodes[index], arrival)
+            return max(zero_cost, arrival - arrivals[index] - waits[index + 1])
+
+        if pickup_index is not None and drop_index is not None:
+            if pickup_index < drop_index:
+                return zero_cost, None, None
+            return None, None, None
+
+        # to_x[k]: r_k -> x, from_x[k]: x -> r_k + 1 (zero after the last stop)
+        to_drop: List[Cost] = []
+        from_drop: List[Cost] = []
+        if drop_index is None:
+            to_drop = [weight(node, drop) for node in nodes]
+            from_drop = [weight(drop, node) for node in nodes[1:]] + [zero_cost]
+        from_pickup: List[Cost] = []
+        pickup_arrivals: List[Cost] = []
+        if pickup_index is None:
+            from_pickup = [weight(pickup, node) for node in nodes[1:]] + [zero_cost]
+            pickup_arrivals = [
+                cls._arrive(graph, pickup, arrivals[index] + weight(node, pickup))
+                for index, node in enumerate(nodes)
+            ]
+
+        best: Tuple[Optional[Cost], Optional[int], Optional[int]] = (None, None, None)
+        if pickup_index is not None:
+            for drop_position in range(pickup_index, last + 1):
+                delay: Cost = end_delay(
+                    drop_position + 1,
+                    arrivals[drop_position]
+                    + to_drop[drop_position]
+                    + from_drop[drop_position],
+                )
+                if best[0] is None or delay < best[0]:
+                    best = (delay, None, drop_position)
+            return best
+
+        if drop_index is not None:
+            for pickup_position in range(drop_index):
+                delay = end_delay(
+                    pickup_position + 1,
+                    pickup_arrivals[pickup_position] + from_pickup[pickup_position],
+                )
+                if best[0] is None or delay < best[0]:
+                    best = (delay, pickup_position, None)
+            return best
+
+        pickup_to_drop: Cost = weight(pickup, drop)
+        for pickup_position in range(last + 1):
+            # delay of the stop right after the pickup, after its own wait
+            if pickup_position < last:
+                next_arrival: Cost = cls._arrive(
+                    graph,
+                    nodes[pickup_position + 1],
+                    pickup_arrivals[pickup_position] + from_pickup[pickup_position],
+                )
+                next_delay: Cost = max(
+                    zero_cost, next_arrival - arrivals[pickup_position + 1]
+                )
+            for drop_position in range(pickup_position, last + 1):
+                if drop_position == pickup_position:
+                    drop_arrival = pickup_arrivals[pickup_position] + pickup_to_drop
+                else:
+                    # stops pickup_position + 2 .. drop_position absorb their waits
+                    drop_arrival = (
+                        arrivals[drop_position]
+                        + max(
+                            zero_cost,
+                            next_delay
+                            - waits[pickup_position + 2]
+                            + waits[drop_position + 1],
+                        )
+                        + to_drop[drop_position]
+                    )
+                delay = end_delay(
+                    drop_position + 1, drop_arrival + from_drop[drop_position]
+                )
+                if best[0] is None or delay < best[0]:
+                    best = (delay, pickup_position, drop_position)
+
+        return best
+
+    @classmethod
+    def _arrive(cls, graph: Graph, node: NodeDTO, arrival: Cost) -> Cost:
+        if node.is_restaurant():
+            return max(graph.get_min_available_time(node), arrival)
+        return arrival
+
+    @classmethod
+    def _find(cls, nodes: List[NodeDTO], object_id: uuid.UUID) -> Optional[int]:
+        for index in range(1, len(nodes)):
+            if nodes[index].object_id == object_id:
+                return index
+        return None
@@ -1,12 +1,141 @@
 import heapq
+import math
+import multiprocessing
+import multiprocessing.pool
+import threading
+import time
 import uuid
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from decimal import Decimal
-from typing import Set, List, Dict, Optional
+from multiprocessing.shared_memory import SharedMemory
+from typing import Set, List, Dict, Optional, Tuple, Iterator, Any
 
-from graphs.dto import Graph, NodeDTO
-from route_finder.dto import RouteDTO, DijkstraNode
-from route_finder.enums import RoutePlanningStrategy
+from graphs.cache import LRUCache, CacheStats
+from graphs.dto import (
+    Graph,
+    NodeDTO,
+    Cost,
+    DenseGraph,
+    LazyGraph,
+    FIXED_POINT_SCALE,
+    HaversineNode,
+)
+from order_matcher.assignment import HungarianAssignmentSolver
+from route_finder.dto import (
+    RouteDTO,
+    DijkstraNode,
+    SearchSpace,
+    SearchStats,
+    LazyWeights,
+)
+from route_finder.enums import RoutePlanningStrategy, PriorityQueueStrategy
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class PriorityQueue(ABC):
+    """
+    Min queue of tuples ordered by their first element (the priority).
+    """
+
+    @abstractmethod
+    def push(self, entry: tuple):
+        pass
+
+    @abstractmethod
+    def pop(self) -> tuple:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class HeapPriorityQueue(PriorityQueue):
+    def __init__(self):
+        self.heap: List[tuple] = []
+
+    def push(self, entry: tuple):
+        heapq.heappush(self.heap, entry)
+
+    def pop(self) -> tuple:
+        return heapq.heappop(self.heap)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+
+class BucketPriorityQueue(PriorityQueue):
+    """
+    Dial's bucket queue for monotone int priorities: one bucket per priority and a
+    cursor that only moves forward, so push and pop are O(1) amortized.
+    Entries with equal priority pop in LIFO order.
+    """
+
+    def __init__(self):
+        self.buckets: Dict[int, List[tuple]] = {}
+        self.cursor = 0
+        self.size = 0
+
+    def push(self, entry: tuple):
+        priority: int = entry[0]
+        if priority < self.cursor:
+            raise Exception("Bucket queue priorities must be monotone")
+
+        bucket: Optional[List[tuple]] = self.buckets.get(priority)
+        if bucket is None:
+            self.buckets[priority] = [entry]
+        else:
+            bucket.append(entry)
+        self.size += 1
+
+    def pop(self) -> tuple:
+        if not self.size:
+            raise IndexError("pop from an empty bucket queue")
+
+        bucket: Optional[List[tuple]] = self.buckets.get(self.cursor)
+        if bucket is None:
+            self._advance()
+            bucket = self.buckets[self.cursor]
+
+        entry: tuple = bucket.pop()
+        if not bucket:
+            del self.buckets[self.cursor]
+        self.size -= 1
+        return entry
+
+    def _advance(self):
+        # Scan forward like Dial's algorithm, but jump straight to the smallest
+        # bucket when the gap is larger than the number of live buckets.
+        for _ in range(len(self.buckets)):
+            self.cursor += 1
+            if self.cursor in self.buckets:
+                return
+
+        self.cursor = min(self.buckets)
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class PriorityQueueFactory:
+    _STRATEGY_TO_PRIORITY_QUEUE = {
+        PriorityQueueStrategy.BINARY_HEAP: HeapPriorityQueue,
+        PriorityQueueStrategy.BUCKET: BucketPriorityQueue,
+    }
+
+    @classmethod
+    def get_priority_queue(
+        cls, strategy: PriorityQueueStrategy, graph: Graph
+    ) -> PriorityQueue:
+        if strategy == PriorityQueueStrategy.BUCKET and not graph.is_fixed_point():
+            raise Exception("Bucket priority queue needs a fixed point cost graph")
+
+        return cls._STRATEGY_TO_PRIORITY_QUEUE[strategy]()
 
 
 class RouteFinder(ABC):
@@ -18,10 +147,151 @@ class RouteFinder(ABC):
     @classmethod
     @abstractmethod
     def find(
-        cls, graph: Graph, customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]]
+        cls,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        stats: Optional[SearchStats] = None,
     ) -> RouteDTO:
         pass
 
+    @classmethod
+    def find_from_state(
+        cls,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        current_node: NodeDTO,
+        visited_mask: int,
+        elapsed_cost: Decimal,
+        warm_start: Optional[RouteDTO] = None,
+        stats: Optional[SearchStats] = None,
+    ) -> RouteDTO:
+        """
+        Re-plans the stops not in visited_mask (bits as in the masks of a returned
+        RouteDTO) for a rider at current_node after elapsed_cost.
+        Only the remaining subproblem is searched, on a subgraph rooted at
+        current_node. warm_start, a previously returned route, is an upper bound:
+        its remaining stops are kept when the search does not beat them.
+        The returned chain starts at current_node with the absolute cost.
+        """
+        search_space: SearchSpace = cls._build_search_space(
+            graph, customer_restaurant_map
+        )
+        start_index: int = cls._get_start_index(search_space, current_node)
+        start_cost: Cost = graph.to_cost(elapsed_cost)
+        best_sequence, best_cost = cls._get_warm_start(
+            search_space, warm_start, start_index, visited_mask, start_cost
+        )
+
+        remaining: List[int] = [
+            index
+            for index in range(search_space.size)
+            if not visited_mask & (1 << index)
+        ]
+        if remaining:
+            visited_object_ids: Set[uuid.UUID] = {
+                search_space.nodes[index].object_id
+                for index in range(search_space.size)
+                if visited_mask & (1 << index)
+            }
+            remaining_customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]] = {
+                customer_id: [
+                    restaurant_id
+                    for restaurant_id in restaurant_ids
+                    if restaurant_id not in visited_object_ids
+                ]
+                for customer_id, restaurant_ids in customer_restaurant_map.items()
+            }
+            route: Optional[RouteDTO] = cls.find(
+                graph.get_subgraph(
+                    current_node,
+                    [search_space.nodes[index] for index in remaining],
+                    start_cost,
+                ),
+                remaining_customer_restaurant_map,
+                stats,
+            )
+            if route is not None:
+                node_index_map: Dict[NodeDTO, int] = cls._get_object_index_map(
+                    search_space.nodes
+                )
+                sequence: List[int] = [
+                    node_index_map[node] for node in cls._get_route_nodes(route)
+                ]
+                cost: Optional[Cost] = search_space.evaluate(
+                    sequence, start_index, visited_mask, start_cost
+                )
+                if cost is not None and (best_cost is None or cost < best_cost):
+                    best_sequence, best_cost = sequence, cost
+        elif best_sequence is None:
+            best_sequence = []
+
+        if best_sequence is None:
+            return None
+
+        return cls._build_route(
+            search_space,
+            search_space.get_steps(
+                best_sequence, start_index, visited_mask, start_cost
+            ),
+        )
+
+    @classmethod
+    def _get_start_index(cls, search_space: SearchSpace, current_node: NodeDTO) -> int:
+        if current_node == search_space.root:
+            return search_space.root_index
+        if current_node not in search_space.nodes:
+            raise Exception(f"Node {current_node.object_id} is not in the graph")
+
+        return search_space.nodes.index(current_node)
+
+    @classmethod
+    def _get_warm_start(
+        cls,
+        search_space: SearchSpace,
+        warm_start: Optional[RouteDTO],
+        start_index: int,
+        visited_mask: int,
+        start_cost: Cost,
+    ) -> Tuple[Optional[List[int]], Optional[Cost]]:
+        """
+        Remaining stops of warm_start in their first visiting order and their cost
+        from the given state, (None, None) if they no longer form a full route.
+        """
+        if warm_start is None:
+            return None, None
+
+        node_index_map: Dict[NodeDTO, int] = cls._get_object_index_map(
+            search_space.nodes
+        )
+        sequence: List[int] = []
+        mask = visited_mask
+        for node in cls._get_route_nodes(warm_start):
+            index: Optional[int] = node_index_map.get(node)
+            if index is not None and not mask & (1 << index):
+                sequence.append(index)
+                mask |= 1 << index
+
+        if mask != search_space.full_mask:
+            return None, None
+
+        cost: Optional[Cost] = search_space.evaluate(
+            sequence, start_index, visited_mask, start_cost
+        )
+        return (None, None) if cost is None else (sequence, cost)
+
+    @classmethod
+    def _get_route_nodes(cls, route: RouteDTO) -> List[NodeDTO]:
+        """
+        Stops of a RouteDTO chain in visiting order, without its root.
+        """
+        nodes: List[NodeDTO] = []
+        while route.previous_route is not None:
+            nodes.append(route.node.get_node())
+            route = route.previous_route
+
+        nodes.reverse()
+        return nodes
+
     @classmethod
     def _get_object_index_map(
         cls, restaurant_nodes: List[NodeDTO]
@@ -40,6 +310,181 @@ class RouteFinder(ABC):
 
         return object_node_map
 
+    @classmethod
+    def _get_required_masks(
+        cls,
+        nodes: List[NodeDTO],
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        object_node_map: Dict[uuid.UUID, NodeDTO],
+        object_index_map: Dict[NodeDTO, int],
+    ) -> List[int]:
+        """
+        Bitmask of the restaurants a node needs visited first, 0 for non customers.
+        """
+        required_masks: List[int] = []
+        for node in nodes:
+            required_mask = 0
+            if node.is_customer():
+                for restaurant in customer_restaurant_map.get(node.object_id, []):
+                    required_mask |= 1 << object_index_map[object_node_map[restaurant]]
+            required_masks.append(required_mask)
+
+        return required_masks
+
+    @classmethod
+    def _build_search_space(
+        cls, graph: Graph, customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]]
+    ) -> SearchSpace:
+        nodes: List[NodeDTO] = graph.get_customer_nodes() + graph.get_restaurant_nodes()
+        object_index_map: Dict[NodeDTO, int] = cls._get_object_index_map(nodes)
+        object_node_map: Dict[uuid.UUID, NodeDTO] = cls._get_object_node_map(nodes)
+        root_index = len(nodes)
+        required_masks: List[int] = cls._get_required_masks(
+            nodes, customer_restaurant_map, object_node_map, object_index_map
+        )
+        object_index_map[graph.root] = root_index
+
+        weights: List[Optional[Cost]] = [None] * ((root_index + 1) ** 2)
+        if isinstance(graph, LazyGraph) and graph.weight_function:
+            weights = LazyWeights(graph, nodes + [graph.root], required_masks)
+        elif isinstance(graph, DenseGraph):
+            dense_indices: List[int] = [
+                graph.index_of(node) for node in nodes + [graph.root]
+            ]
+            for from_index, from_dense_index in enumerate(dense_indices):
+                offset = from_index * (root_index + 1)
+                for to_index, to_dense_index in enumerate(dense_indices):
+                    if from_index != to_index:
+                        weights[offset + to_index] = graph.weight(
+                            from_dense_index, to_dense_index
+                        )
+        else:
+            for from_node in nodes + [graph.root]:
+                offset = object_index_map[from_node] * (root_index + 1)
+                for edge in graph.get_edges(from_node):
+                    to_index: Optional[int] = object_index_map.get(edge.to_node)
+                    if to_index is not None:
+                        weights[offset + to_index] = edge.weight
+
+        return SearchSpace(
+            graph,
+            nodes,
+            weights,
+            required_masks,
+            [graph.get_min_available_time(node) for node in nodes],
+        )
+
+    @classmethod
+    def _build_route(
+        cls, search_space: SearchSpace, steps: List[Tuple[int, Cost, int]]
+    ) -> RouteDTO:
+        """
+        Builds the RouteDTO chain once from (node_index, cost, mask) steps,
+        the first step being the root. Costs are converted back to Decimal here.
+        """
+        graph: Graph = search_space.graph
+        route: Optional[RouteDTO] = None
+        for node_index, cost, mask in steps:
+            decimal_cost: Decimal = graph.to_decimal(cost)
+            dijkstra_node = DijkstraNode(
+                search_space.get_node(node_index), decimal_cost, mask
+            )
+            route = RouteDTO(dijkstra_node, decimal_cost, previous_route=route)
+
+        return route
+
+    @classmethod
+    def _to_decimal_route(cls, graph: Graph, route: Optional[RouteDTO]) -> RouteDTO:
+        if route is None or not graph.is_fixed_point():
+            return route
+
+        routes: List[RouteDTO] = []
+        while route:
+            routes.append(route)
+            route = route.previous_route
+
+        decimal_route: Optional[RouteDTO] = None
+        for route in reversed(routes):
+            cost: Decimal = graph.to_decimal(route.cost_till_here)
+            dijkstra_node = DijkstraNode(route.node.get_node(), cost, route.node.mask)
+            decimal_route = RouteDTO(dijkstra_node, cost, previous_route=decimal_route)
+
+        return decimal_route
+
+    @classmethod
+    def _get_steps(
+        cls,
+        state: int,
+        row_size: int,
+        parents: Dict[int, int],
+        costs: Dict[int, Cost],
+    ) -> List[Tuple[int, Cost, int]]:
+        steps: List[Tuple[int, Cost, int]] = []
+        while state != -1:
+            mask, index = divmod(state, row_size)
+            steps.append((index, costs[state], mask))
+            state = parents[state]
+
+        steps.reverse()
+        return steps
+
+    @classmethod
+    def _record_stats(
+        cls,
+        stats: Optional[SearchStats],
+        states_pushed: int,
+        states_expanded: int,
+        pushes_avoided: int = 0,
+    ):
+        if stats is not None:
+            stats.states_pushed += states_pushed
+            stats.states_expanded += states_expanded
+            stats.pushes_avoided += pushes_avoided
+
+    @classmethod
+    def _get_cheapest_incoming(cls, search_space: SearchSpace) -> List[Cost]:
+        cheapest_incoming: List[Cost] = []
+        for to_index in range(search_space.size):
+            cheapest_incoming.append(
+                min(
+                    search_space.weight(from_index, to_index)
+                    for from_index in range(search_space.size + 1)
+                    if search_space.weight(from_index, to_index) is not None
+                )
+            )
+
+        return cheapest_incoming
+
+    @classmethod
+    def _get_lower_bound(
+        cls,
+        search_space: SearchSpace,
+        cheapest_incoming: List[Cost],
+        bounds: Dict[int, Tuple[Cost, Cost]],
+        mask: int,
+        cost: Cost,
+        zero: Cost,
+    ) -> Cost:
+        """
+        Consistent lower bound on the cost still to come after reaching mask
+        at cost, see AStarWithMaskRouteFinder. Memoized per mask in bounds.
+        """
+        if mask not in bounds:
+            travel_bound: Cost = zero
+            latest_available_time: Cost = zero
+            for index in range(search_space.size):
+                if mask & (1 << index):
+                    continue
+                travel_bound += cheapest_incoming[index]
+                if search_space.restaurant_flags[index]:
+                    latest_available_time = max(
+                        latest_available_time, search_space.min_available_times[index]
+                    )
+            bounds[mask] = (travel_bound, latest_available_time)
+
+        travel_bound, latest_available_time = bounds[mask]
+        return max(travel_bound, latest_available_time - cost)
+
 
 class DijkstraWithMaskRouteFinder(RouteFinder):
     @classmethod
@@ -48,94 +493,1704 @@ class DijkstraWithMaskRouteFinder(RouteFinder):
 
     @classmethod
     def find(
-        cls, graph: Graph, customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]]
+        cls,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        stats: Optional[SearchStats] = None,
     ) -> RouteDTO:
         root: NodeDTO = graph.root
-        root_node = DijkstraNode(root, Decimal("0"), 0)
+        zero_cost: Cost = graph.zero_cost()
+        root_node = DijkstraNode(root, zero_cost, 0)
         nodes: List[NodeDTO] = graph.get_customer_nodes() + graph.get_restaurant_nodes()
         object_index_map: Dict[NodeDTO, int] = cls._get_object_index_map(nodes)
         object_node_map: Dict[uuid.UUID, NodeDTO] = cls._get_object_node_map(nodes)
+        full_mask: int = (1 << (len(graph.nodes) - 1)) - 1
+        row_size: int = len(nodes) + 1
+        # per node lists indexed by object_index_map, built once instead of
+        # converting prep times and hashing nodes on every relaxation
+        required_masks: List[int] = cls._get_required_masks(
+            nodes, customer_restaurant_map, object_node_map, object_index_map
+        )
+        restaurant_flags: List[bool] = [node.is_restaurant() for node in nodes]
+        min_available_times: List[Cost] = [
+            graph.get_min_available_time(node) for node in nodes
+        ]
+        # (to_index, weight) edges of a node, read from the graph on its first pop
+        edge_rows: List[Optional[List[Tuple[int, Cost]]]] = [None] * row_size
 
         heap = []
-        heapq.heappush(heap, (root_node, RouteDTO(root_node, Decimal("0"), None)))
-        visited: Set[DijkstraNode] = set()
+        # (cost, mask) first so that heap comparisons stay on plain numbers
+        heapq.heappush(
+            heap,
+            (zero_cost, 0, len(nodes), root_node, RouteDTO(root_node, zero_cost, None)),
+        )
+        visited: Set[int] = set()
+        best_costs: Dict[int, Cost] = {}
         best_route: Optional[RouteDTO] = None
+        states_pushed = 1
+        pushes_avoided = 0
 
         while heap:
-            dijkstra_node, route_till_here = heapq.heappop(heap)
-            if dijkstra_node in visited:
+            _, from_mask, index, dijkstra_node, route_till_here = heapq.heappop(heap)
+            from_state: int = from_mask * row_size + index
+            if from_state in visited:
                 continue
 
-            visited.add(dijkstra_node)
+            visited.add(from_state)
 
-            if cls._is_complete(graph, dijkstra_node):
+            if cls._is_complete(dijkstra_node, full_mask):
                 best_route = route_till_here
                 break
 
-            for edge in graph.get_edges(dijkstra_node.get_node()):
-                to_node: NodeDTO = edge.to_node
-                cost: Decimal = edge.weight
-                mask: int = dijkstra_node.get_mask()
-                new_cost: Optional[Decimal] = None
-                if to_node.is_customer() and cls._all_restaurants_visited(
-                    customer_restaurant_map.get(to_node.object_id, []),
-                    mask,
-                    object_node_map,
-                    object_index_map,
-                ):
-                    customer_index = object_index_map[to_node]
-                    new_cost: Decimal = dijkstra_node.get_cost() + cost
-                    mask |= 1 << customer_index
-                elif to_node.is_restaurant():
-                    restaurant_index = object_index_map[to_node]
-                    min_available_time: Decimal = to_node.min_available_time
-                    new_cost: Decimal = max(
-                        min_available_time, dijkstra_node.get_cost() + cost
+            if edge_rows[index] is None:
+                edge_rows[index] = [
+                    (object_index_map[edge.to_node], edge.weight)
+                    for edge in graph.get_edges(dijkstra_node.get_node())
+                    if edge.to_node in object_index_map
+                ]
+
+            from_cost: Cost = dijkstra_node.get_cost()
+            for to_index, weight in edge_rows[index]:
+                mask: int = from_mask
+                new_cost: Cost = from_cost + weight
+                if restaurant_flags[to_index]:
+                    new_cost = max(min_available_times[to_index], new_cost)
+                else:
+                    required_mask: int = required_masks[to_index]
+                    if mask & required_mask != required_mask:
+                        continue
+                mask |= 1 << to_index
+
+                state: int = mask * row_size + to_index
+                best_cost: Optional[Cost] = best_costs.get(state)
+                if best_cost is not None and best_cost <= new_cost:
+                    pushes_avoided += 1
+                    continue
+
+                best_costs[state] = new_cost
+                to_dijkstra_node: DijkstraNode = DijkstraNode(
+                    nodes[to_index], new_cost, mask
+                )
+                new_route: RouteDTO = RouteDTO(
+                    to_dijkstra_node,
+                    to_dijkstra_node.get_cost(),
+                    previous_route=route_till_here,
+                )
+                heapq.heappush(
+                    heap, (new_cost, mask, to_index, to_dijkstra_node, new_route)
+                )
+                states_pushed += 1
+
+        cls._record_stats(stats, states_pushed, len(visited), pushes_avoided)
+        return cls._to_decimal_route(graph, best_route)
+
+    @classmethod
+    def _is_complete(cls, node: DijkstraNode, full_mask: int) -> bool:
+        return node.mask & full_mask == full_mask
+
+
+class CompactDijkstraWithMaskRouteFinder(RouteFinder):
+    """
+    Same search as DijkstraWithMaskRouteFinder, but a queue entry is the plain tuple
+    (cost, mask, node_index, parent_state) and a state is packed as
+    mask * (n + 1) + node_index. Settled states keep a parent pointer and the
+    RouteDTO chain is built only once, for the best route.
+    """
+
+    @classmethod
+    def get_strategy(cls):
+        return RoutePlanningStrategy.COMPACT_DIJKSTRA_WITH_MASK
+
+    @classmethod
+    def find(
+        cls,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        stats: Optional[SearchStats] = None,
+        queue_strategy: PriorityQueueStrategy = PriorityQueueStrategy.BINARY_HEAP,
+    ) -> RouteDTO:
+        search_space: SearchSpace = cls._build_search_space(
+            graph, customer_restaurant_map
+        )
+        n = search_space.size
+        row_size = n + 1
+        full_mask = search_space.full_mask
+        weights = search_space.weights
+        required_masks = search_space.required_masks
+        restaurant_flags = search_space.restaurant_flags
+        min_available_times = search_space.min_available_times
+
+        queue: PriorityQueue = PriorityQueueFactory.get_priority_queue(
+            queue_strategy, graph
+        )
+        push, pop = queue.push, queue.pop
+        push((graph.zero_cost(), 0, search_space.root_index, -1))
+        parents: Dict[int, int] = {}
+        costs: Dict[int, Cost] = {}
+        best_costs: Dict[int, Cost] = {}
+        best_state: Optional[int] = None
+        states_pushed = 1
+        pushes_avoided = 0
+
+        while queue:
+            cost, mask, index, parent_state = pop()
+            state = mask * row_size + index
+            if state in parents:
+                continue
+
+            parents[state] = parent_state
+            costs[state] = cost
+
+            if mask & full_mask == full_mask:
+                best_state = state
+                break
+
+            offset = index * row_size
+            for next_index in range(n):
+                required_mask = required_masks[next_index]
+                if next_index == index or mask & required_mask != required_mask:
+                    continue
+                weight: Optional[Cost] = weights[offset + next_index]
+                if weight is None:
+                    continue
+                new_cost = cost + weight
+                if restaurant_flags[next_index]:
+                    new_cost = max(min_available_times[next_index], new_cost)
+                new_mask = mask | (1 << next_index)
+                new_state = new_mask * row_size + next_index
+                best_cost = best_costs.get(new_state)
+                if best_cost is not None and best_cost <= new_cost:
+                    pushes_avoided += 1
+                    continue
+
+                best_costs[new_state] = new_cost
+                push((new_cost, new_mask, next_index, state))
+                states_pushed += 1
+
+        cls._record_stats(stats, states_pushed, len(parents), pushes_avoided)
+        if best_state is None:
+            return None
+
+        return cls._build_route(
+            search_space, cls._get_steps(best_state, row_size, parents, costs)
+        )
+
+
+class AStarWithMaskRouteFinder(RouteFinder):
+    """
+    Compact mask search ordered by cost + lower bound on the remaining cost.
+    The bound over the unvisited stops of a mask is the larger of
+    - the sum of the cheapest incoming edge of every unvisited stop
+    - the largest min_available_time among unvisited restaurants, minus the cost so far
+    Both are consistent, so the first complete state popped is optimal and the
+    result matches DijkstraWithMaskRouteFinder.
+    """
+
+    @classmethod
+    def get_strategy(cls):
+        return RoutePlanningStrategy.A_STAR_WITH_MASK
+
+    @classmethod
+    def find(
+        cls,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        stats: Optional[SearchStats] = None,
+        queue_strategy: PriorityQueueStrategy = PriorityQueueStrategy.BINARY_HEAP,
+    ) -> RouteDTO:
+        search_space: SearchSpace = cls._build_search_space(
+            graph, customer_restaurant_map
+        )
+        n = search_space.size
+        row_size = n + 1
+        full_mask = search_space.full_mask
+        weights = search_space.weights
+        required_masks = search_space.required_masks
+        restaurant_flags = search_space.restaurant_flags
+        min_available_times = search_space.min_available_times
+        zero = graph.zero_cost()
+        cheapest_incoming: List[Cost] = cls._get_cheapest_incoming(search_space)
+        bounds: Dict[int, Tuple[Cost, Cost]] = {}
+
+        queue: PriorityQueue = PriorityQueueFactory.get_priority_queue(
+            queue_strategy, graph
+        )
+        push, pop = queue.push, queue.pop
+        push(
+            (
+                cls._get_lower_bound(
+                    search_space, cheapest_incoming, bounds, 0, zero, zero
+                ),
+                0,
+                search_space.root_index,
+                zero,
+                -1,
+            )
+        )
+        parents: Dict[int, int] = {}
+        costs: Dict[int, Cost] = {}
+        best_costs: Dict[int, Cost] = {}
+        best_state: Optional[int] = None
+        states_pushed = 1
+        pushes_avoided = 0
+
+        while queue:
+            _, mask, index, cost, parent_state = pop()
+            state = mask * row_size + index
+            if state in parents:
+                continue
+
+            parents[state] = parent_state
+            costs[state] = cost
+
+            if mask & full_mask == full_mask:
+                best_state = state
+                break
+
+            offset = index * row_size
+            for next_index in range(n):
+                required_mask = required_masks[next_index]
+                if next_index == index or mask & required_mask != required_mask:
+                    continue
+                weight: Optional[Cost] = weights[offset + next_index]
+                if weight is None:
+                    continue
+                new_cost = cost + weight
+                if restaurant_flags[next_index]:
+                    new_cost = max(min_available_times[next_index], new_cost)
+                new_mask = mask | (1 << next_index)
+                new_state = new_mask * row_size + next_index
+                best_cost = best_costs.get(new_state)
+                if best_cost is not None and best_cost <= new_cost:
+                    pushes_avoided += 1
+                    continue
+
+                best_costs[new_state] = new_cost
+                estimate = new_cost + cls._get_lower_bound(
+                    search_space, cheapest_incoming, bounds, new_mask, new_cost, zero
+                )
+                push((estimate, new_mask, next_index, new_cost, state))
+                states_pushed += 1
+
+        cls._record_stats(stats, states_pushed, len(parents), pushes_avoided)
+        if best_state is None:
+            return None
+
+        return cls._build_route(
+            search_space, cls._get_steps(best_state, row_size, parents, costs)
+        )
+
+
+class HeldKarpRouteFinder(RouteFinder):
+    """
+    Bitmask DP over dp[mask][last_node] with flat tables.
+    Every stop is visited exactly once, restaurants before their customers,
+    and arriving at a restaurant early waits for its min_available_time.
+    Memory is bounded by 2 * 2^n * n table slots for n stops.
+    """
+
+    MAX_STOPS = 20
+
+    @classmethod
+    def get_strategy(cls):
+        return RoutePlanningStrategy.ALL_POSSIBLE_PATHS
+
+    @classmethod
+    def find(
+        cls,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        stats: Optional[SearchStats] = None,
+    ) -> RouteDTO:
+        search_space: SearchSpace = cls._build_search_space(
+            graph, customer_restaurant_map
+        )
+        n = search_space.size
+        if n > cls.MAX_STOPS:
+            raise Exception(f"Held-Karp supports at most {cls.MAX_STOPS} stops")
+
+        zero = graph.zero_cost()
+        if n == 0:
+            return cls._build_route(search_space, [(search_space.root_index, zero, 0)])
+
+        weights = search_space.weights
+        required_masks = search_space.required_masks
+        restaurant_flags = search_space.restaurant_flags
+        min_available_times = search_space.min_available_times
+        row_size = n + 1
+        full_mask = search_space.full_mask
+
+        dp: List[Optional[Cost]] = [None] * ((full_mask + 1) * n)
+        parent: List[int] = [-1] * ((full_mask + 1) * n)
+
+        root_offset = search_space.root_index * row_size
+        for next_index in range(n):
+            if required_masks[next_index]:
+                continue
+            new_cost = zero + weights[root_offset + next_index]
+            if restaurant_flags[next_index]:
+                new_cost = max(min_available_times[next_index], new_cost)
+            slot = (1 << next_index) * n + next_index
+            dp[slot] = new_cost
+            parent[slot] = search_space.root_index
+
+        states_pushed = 0
+        states_expanded = 0
+        for mask in range(1, full_mask):
+            base = mask * n
+            candidates = [
+                next_index
+                for next_index in range(n)
+                if not mask & (1 << next_index)
+                and mask & required_masks[next_index] == required_masks[next_index]
+            ]
+            for last_index in range(n):
+                cost = dp[base + last_index]
+                if cost is None:
+                    continue
+                states_expanded += 1
+                offset = last_index * row_size
+                for next_index in candidates:
+                    new_cost = cost + weights[offset + next_index]
+                    if restaurant_flags[next_index]:
+                        new_cost = max(min_available_times[next_index], new_cost)
+                    slot = (mask | (1 << next_index)) * n + next_index
+                    current = dp[slot]
+                    if current is None or new_cost < current:
+                        dp[slot] = new_cost
+                        parent[slot] = last_index
+                        states_pushed += 1
+
+        cls._record_stats(stats, states_pushed, states_expanded)
+        base = full_mask * n
+        last_index: Optional[int] = None
+        for index in range(n):
+            cost = dp[base + index]
+            if cost is not None and (
+                last_index is None or cost < dp[base + last_index]
+            ):
+                last_index = index
+
+        if last_index is None:
+            return None
+
+        steps: List[Tuple[int, Cost, int]] = []
+        mask = full_mask
+        while last_index != search_space.root_index:
+            steps.append((last_index, dp[mask * n + last_index], mask))
+            previous_index = parent[mask * n + last_index]
+            mask ^= 1 << last_index
+            last_index = previous_index
+
+        steps.append((search_space.root_index, zero, 0))
+        steps.reverse()
+        return cls._build_route(search_space, steps)
+
+
+@dataclass
+class HeldKarpTables:
+    """
+    Shared memory dp / parent views plus the int cost inputs of one
+    ParallelHeldKarpRouteFinder.find call.
+    """
+
+    dp: memoryview
+    parent: memoryview
+    size: int
+    weights: List[int]
+    required_masks: List[int]
+    restaurant_flags: List[bool]
+    min_available_times: List[int]
+
+    def release(self):
+        self.dp.release()
+        self.parent.release()
+
+
+# pools of ParallelHeldKarpRouteFinder by process count, started on first use and
+# shared by every find call; tasks carry the shared memory names they work on
+_pools: Dict[int, multiprocessing.pool.Pool] = {}
+_pool_lock = threading.Lock()
+
+
+class ParallelHeldKarpRouteFinder(RouteFinder):
+    """
+    Held-Karp with dp[mask][last] and parent[mask][last] in shared memory,
+    filled one popcount layer at a time over the masks that hold every restaurant
+    of their customers. A worker pulls dp[mask][last] from the previous layer, so
+    it only writes the masks it owns. Costs in the table are ints in
+    1 / FIXED_POINT_SCALE units; the returned route is re-costed on the graph's
+    own cost type.
+    Below MIN_PARALLEL_STOPS stops HeldKarpRouteFinder is as fast or faster and
+    is used instead. Layers of at least MIN_PARALLEL_LAYER_SIZE masks are split
+    over a module level process pool, started on first use and reused by later
+    calls, when processes >= 2; smaller layers run in process. Like
+    HeldKarpRouteFinder it is limited to MAX_STOPS = 20 stops (10 orders): the
+    tables take 9 * 2^n * n bytes, about 190 MB at 20 stops but 67 GB at 28
+    stops (14 orders).
+    """
+
+    MAX_STOPS = HeldKarpRouteFinder.MAX_STOPS
+    MIN_PARALLEL_STOPS = 10
+    MIN_PARALLEL_LAYER_SIZE = 2048
+    CHUNKS_PER_PROCESS = 4
+    INFINITY = 1 << 62
+
+    @classmethod
+    def get_strategy(cls):
+        return RoutePlanningStrategy.PARALLEL_ALL_POSSIBLE_PATHS
+
+    @classmethod
+    def find(
+        cls,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        stats: Optional[SearchStats] = None,
+        processes: Optional[int] = None,
+    ) -> RouteDTO:
+        search_space: SearchSpace = cls._build_search_space(
+            graph, customer_restaurant_map
+        )
+        n = search_space.size
+        if n > cls.MAX_STOPS:
+            raise Exception(f"Held-Karp supports at most {cls.MAX_STOPS} stops")
+        if n == 0:
+            return cls._build_route(search_space, search_space.get_steps([]))
+
+        if n < cls.MIN_PARALLEL_STOPS:
+            return HeldKarpRouteFinder.find(graph, customer_restaurant_map, stats)
+
+        processes = processes or multiprocessing.cpu_count()
+
+        slots = (1 << n) * n
+        dp_memory = SharedMemory(create=True, size=slots * 8)
+        parent_memory = SharedMemory(create=True, size=slots)
+        tables: Optional[HeldKarpTables] = None
+        try:
+            inputs = (
+                n,
+                [cls._to_int_cost(graph, weight) for weight in search_space.weights],
+                search_space.required_masks,
+                search_space.restaurant_flags,
+                [
+                    cls._to_int_cost(graph, min_available_time)
+                    for min_available_time in search_space.min_available_times
+                ],
+            )
+            tables = cls._get_tables(dp_memory, parent_memory, *inputs)
+            states_expanded = cls._fill_first_layer(search_space, tables)
+            masks: List[int] = [
+                1 << index
+                for index in range(n)
+                if not search_space.required_masks[index]
+            ]
+            for _ in range(2, n + 1):
+                masks = cls._get_next_layer(masks, search_space.required_masks)
+                if processes < 2 or len(masks) < cls.MIN_PARALLEL_LAYER_SIZE:
+                    states_expanded += cls._compute_masks(tables, masks)
+                    continue
+
+                chunk_size = -(-len(masks) // (processes * cls.CHUNKS_PER_PROCESS))
+                tasks = [
+                    (
+                        dp_memory.name,
+                        parent_memory.name,
+                        *inputs,
+                        masks[start : start + chunk_size],
                     )
-                    mask |= 1 << restaurant_index
+                    for start in range(0, len(masks), chunk_size)
+                ]
+                states_expanded += sum(
+                    cls._get_pool(processes).map(cls._compute_worker_masks, tasks)
+                )
+
+            sequence: Optional[List[int]] = cls._get_sequence(tables)
+        finally:
+            if tables is not None:
+                tables.release()
+            for memory in (dp_memory, parent_memory):
+                memory.close()
+                memory.unlink()
+
+        cls._record_stats(stats, states_expanded, states_expanded)
+        if sequence is None:
+            return None
+
+        return cls._build_route(search_space, search_space.get_steps(sequence))
+
+    @classmethod
+    def _get_next_layer(cls, masks: List[int], required_masks: List[int]) -> List[int]:
+        """
+        Masks one stop bigger than masks that still hold every restaurant of their
+        customers. Other masks are unreachable and are never filled or read.
+        """
+        next_masks: Set[int] = set()
+        for mask in masks:
+            for index, required_mask in enumerate(required_masks):
+                if not mask & (1 << index) and mask & required_mask == required_mask:
+                    next_masks.add(mask | (1 << index))
+
+        return sorted(next_masks)
+
+    @classmethod
+    def _get_pool(cls, processes: int) -> multiprocessing.pool.Pool:
+        with _pool_lock:
+            if processes not in _pools:
+                _pools[processes] = multiprocessing.Pool(processes)
+            return _pools[processes]
+
+    @classmethod
+    def _to_int_cost(cls, graph: Graph, cost: Optional[Cost]) -> int:
+        if cost is None:
+            return cls.INFINITY
+        if graph.is_fixed_point():
+            return cost
+        return int((cost * FIXED_POINT_SCALE).to_integral_value())
+
+    @classmethod
+    def _get_tables(
+        cls,
+        dp_memory: SharedMemory,
+        parent_memory: SharedMemory,
+        size: int,
+        weights: List[int],
+        required_masks: List[int],
+        restaurant_flags: List[bool],
+        min_available_times: List[int],
+    ) -> HeldKarpTables:
+        return HeldKarpTables(
+            dp=dp_memory.buf.cast("q"),
+            parent=parent_memory.buf.cast("b"),
+            size=size,
+            weights=weights,
+            required_masks=required_masks,
+            restaurant_flags=restaurant_flags,
+            min_available_times=min_available_times,
+        )
+
+    @classmethod
+    def _compute_worker_masks(cls, task: tuple) -> int:
+        """
+        Runs in a pool worker: attaches to the shared tables named in the task,
+        fills its masks and detaches again.
+        """
+        dp_name, parent_name, *inputs, masks = task
+        memories: List[SharedMemory] = [
+            SharedMemory(name=dp_name),
+            SharedMemory(name=parent_name),
+        ]
+        tables: HeldKarpTables = cls._get_tables(*memories, *inputs)
+        try:
+            return cls._compute_masks(tables, masks)
+        finally:
+            tables.release()
+            for memory in memories:
+                memory.close()
+
+    @classmethod
+    def _fill_first_layer(
+        cls, search_space: SearchSpace, tables: HeldKarpTables
+    ) -> int:
+        n = tables.size
+        root_offset = search_space.root_index * (n + 1)
+        for index in range(n):
+            slot = (1 << index) * n + index
+            cost = cls.INFINITY
+            if not tables.required_masks[index]:
+                cost = tables.weights[root_offset + index]
+                if tables.restaurant_flags[index]:
+                    cost = max(tables.min_available_times[index], cost)
+            tables.dp[slot] = cost
+            tables.parent[slot] = n
+
+        return n
+
+    @classmethod
+    def _compute_masks(cls, tables: HeldKarpTables, masks: List[int]) -> int:
+        n = tables.size
+        row_size = n + 1
+        dp = tables.dp
+        parent = tables.parent
+        weights = tables.weights
+        required_masks = tables.required_masks
+        restaurant_flags = tables.restaurant_flags
+        min_available_times = tables.min_available_times
+        infinity = cls.INFINITY
+        # customers that need index, a mask without index must not hold them
+        dependent_masks: List[int] = [
+            sum(
+                1 << customer_index
+                for customer_index in range(n)
+                if required_masks[customer_index] & (1 << index)
+            )
+            for index in range(n)
+        ]
+        states_expanded = 0
+
+        for mask in masks:
+            base = mask * n
+            members = [index for index in range(n) if mask & (1 << index)]
+            for last_index in members:
+                previous_mask = mask ^ (1 << last_index)
+                best_cost = infinity
+                best_parent = -1
+                if not previous_mask & dependent_masks[last_index]:
+                    previous_base = previous_mask * n
+                    for previous_index in members:
+                        if previous_index == last_index:
+                            continue
+                        cost = dp[previous_base + previous_index]
+                        if cost == infinity:
+                            continue
+                        cost += weights[previous_index * row_size + last_index]
+                        if cost < best_cost:
+                            best_cost = cost
+                            best_parent = previous_index
+                    if best_cost != infinity:
+                        states_expanded += 1
+                        if restaurant_flags[last_index]:
+                            best_cost = max(min_available_times[last_index], best_cost)
+                dp[base + last_index] = best_cost
+                parent[base + last_index] = best_parent
+
+        return states_expanded
+
+    @classmethod
+    def _get_sequence(cls, tables: HeldKarpTables) -> Optional[List[int]]:
+        n = tables.size
+        dp = tables.dp
+        parent = tables.parent
+        mask = (1 << n) - 1
+        last_index = min(range(n), key=lambda index: dp[mask * n + index])
+        if dp[mask * n + last_index] == cls.INFINITY:
+            return None
+
+        sequence: List[int] = []
+        while last_index != n:
+            sequence.append(last_index)
+            previous_index = parent[mask * n + last_index]
+            mask ^= 1 << last_index
+            last_index = previous_index
+
+        sequence.reverse()
+        return sequence
+
+
+class VectorizedHeldKarpRouteFinder(RouteFinder):
+    """
+    Held-Karp with every popcount layer computed as NumPy array operations.
+    For each last stop, all masks of the layer pull from dp[mask ^ last] at once;
+    unreachable slots and precedence violations stay at inf.
+    Falls back to HeldKarpRouteFinder when NumPy is not installed.
+    """
+
+    MAX_STOPS = HeldKarpRouteFinder.MAX_STOPS
+
+    @classmethod
+    def get_strategy(cls):
+        return RoutePlanningStrategy.VECTORIZED_ALL_POSSIBLE_PATHS
+
+    @classmethod
+    def find(
+        cls,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        stats: Optional[SearchStats] = None,
+    ) -> RouteDTO:
+        if np is None:
+            return HeldKarpRouteFinder.find(graph, customer_restaurant_map, stats)
+
+        search_space: SearchSpace = cls._build_search_space(
+            graph, customer_restaurant_map
+        )
+        n = search_space.size
+        if n > cls.MAX_STOPS:
+            raise Exception(f"Held-Karp supports at most {cls.MAX_STOPS} stops")
+        if n == 0:
+            return cls._build_route(search_space, search_space.get_steps([]))
+
+        weights = np.array(
+            [
+                np.inf if weight is None else float(weight)
+                for weight in search_space.weights
+            ]
+        ).reshape(n + 1, n + 1)
+        required_masks = np.array(search_space.required_masks, dtype=np.int64)
+        min_available_times = np.array(
+            [
+                float(min_available_time) if is_restaurant else -np.inf
+                for min_available_time, is_restaurant in zip(
+                    search_space.min_available_times, search_space.restaurant_flags
+                )
+            ]
+        )
+
+        masks = np.arange(1 << n, dtype=np.int64)
+        popcounts = np.zeros(1 << n, dtype=np.int64)
+        for index in range(n):
+            popcounts += (masks >> index) & 1
+        masks = masks[np.argsort(popcounts, kind="stable")]
+        layer_bounds = np.searchsorted(np.sort(popcounts), np.arange(n + 2))
+
+        dp = np.full((1 << n, n), np.inf)
+        parent = np.full((1 << n, n), -1, dtype=np.int8)
+        for index in range(n):
+            if not required_masks[index]:
+                dp[1 << index, index] = max(
+                    min_available_times[index], weights[n, index]
+                )
+                parent[1 << index, index] = n
+
+        states_expanded = n
+        for size in range(2, n + 1):
+            layer = masks[layer_bounds[size] : layer_bounds[size + 1]]
+            for last_index in range(n):
+                bit = 1 << last_index
+                layer_masks = layer[(layer & bit) != 0]
+                previous_masks = layer_masks ^ bit
+                required_mask = required_masks[last_index]
+                feasible = (previous_masks & required_mask) == required_mask
+                layer_masks = layer_masks[feasible]
+                if not len(layer_masks):
+                    continue
+
+                candidates = dp[previous_masks[feasible]] + weights[:n, last_index]
+                best_parents = candidates.argmin(axis=1)
+                best_costs = np.maximum(
+                    candidates[np.arange(len(layer_masks)), best_parents],
+                    min_available_times[last_index],
+                )
+                reachable = np.isfinite(best_costs)
+                dp[layer_masks[reachable], last_index] = best_costs[reachable]
+                parent[layer_masks[reachable], last_index] = best_parents[reachable]
+                states_expanded += int(reachable.sum())
+
+        cls._record_stats(stats, states_expanded, states_expanded)
+        mask = search_space.full_mask
+        last_index = int(dp[mask].argmin())
+        if not np.isfinite(dp[mask, last_index]):
+            return None
+
+        sequence: List[int] = []
+        while last_index != n:
+            sequence.append(last_index)
+            previous_index = int(parent[mask, last_index])
+            mask ^= 1 << last_index
+            last_index = previous_index
+
+        sequence.reverse()
+        return cls._build_route(search_space, search_space.get_steps(sequence))
+
+
+class CheapestInsertionRouteFinder(RouteFinder):
+    """
+    Heuristic for batches beyond what the exact finders handle.
+    Builds a precedence feasible sequence by cheapest (travel) insertion, then runs
+    first improvement local search with relocate, or-opt and 2-opt moves on the
+    real cost (waits included) until no move improves or time_budget runs out.
+    """
+
+    DEFAULT_TIME_BUDGET_SECONDS = 0.1
+    SEGMENT_LENGTHS = (1, 2, 3)
+
+    @classmethod
+    def get_strategy(cls):
+        return RoutePlanningStrategy.CHEAPEST_INSERTION_WITH_LOCAL_SEARCH
+
+    @classmethod
+    def find(
+        cls,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        stats: Optional[SearchStats] = None,
+        time_budget: float = DEFAULT_TIME_BUDGET_SECONDS,
+    ) -> RouteDTO:
+        deadline: float = time.monotonic() + time_budget
+        search_space: SearchSpace = cls._build_search_space(
+            graph, customer_restaurant_map
+        )
+        sequence: List[int] = cls._construct(search_space)
+        sequence, evaluations = cls._improve(search_space, sequence, deadline)
+        cls._record_stats(stats, 0, evaluations)
+        return cls._build_route(search_space, search_space.get_steps(sequence))
+
+    @classmethod
+    def _construct(cls, search_space: SearchSpace) -> List[int]:
+        row_size = search_space.size + 1
+        weights = search_space.weights
+        required_masks = search_space.required_masks
+        sequence: List[int] = []
+        positions: Dict[int, int] = {}
+        routed_mask = 0
+
+        while len(sequence) < search_space.size:
+            best: Optional[Tuple[Cost, int, int]] = None
+            for stop in range(search_space.size):
+                required_mask = required_masks[stop]
+                if (
+                    routed_mask & (1 << stop)
+                    or routed_mask & required_mask != required_mask
+                ):
+                    continue
+
+                earliest = 0
+                for restaurant, position in positions.items():
+                    if required_mask & (1 << restaurant):
+                        earliest = max(earliest, position + 1)
 
-                if new_cost is not None:
-                    to_dijkstra_node: DijkstraNode = DijkstraNode(
-                        to_node, new_cost, mask
+                for position in range(earliest, len(sequence) + 1):
+                    previous = (
+                        sequence[position - 1] if position else search_space.root_index
                     )
-                    new_route: RouteDTO = RouteDTO(
-                        to_dijkstra_node,
-                        to_dijkstra_node.get_cost(),
-                        previous_route=route_till_here,
+                    delta = weights[previous * row_size + stop]
+                    if position < len(sequence):
+                        following = sequence[position]
+                        delta += (
+                            weights[stop * row_size + following]
+                            - weights[previous * row_size + following]
+                        )
+                    if best is None or delta < best[0]:
+                        best = (delta, stop, position)
+
+            _, stop, position = best
+            sequence.insert(position, stop)
+            positions = {index: position for position, index in enumerate(sequence)}
+            routed_mask |= 1 << stop
+
+        return sequence
+
+    @classmethod
+    def _improve(
+        cls, search_space: SearchSpace, sequence: List[int], deadline: float
+    ) -> Tuple[List[int], int]:
+        best_cost: Cost = search_space.evaluate(sequence)
+        evaluations = 1
+        improved = True
+        while improved:
+            improved = False
+            for candidate in cls._get_neighbours(sequence):
+                if time.monotonic() >= deadline:
+                    return sequence, evaluations
+
+                cost: Optional[Cost] = search_space.evaluate(candidate)
+                evaluations += 1
+                if cost is not None and cost < best_cost:
+                    sequence, best_cost = candidate, cost
+                    improved = True
+                    break
+
+        return sequence, evaluations
+
+    @classmethod
+    def _get_neighbours(cls, sequence: List[int]) -> Iterator[List[int]]:
+        size = len(sequence)
+        # relocate (segment of 1) and or-opt (segments of 2 and 3)
+        for length in cls.SEGMENT_LENGTHS:
+            for start in range(size - length + 1):
+                segment = sequence[start : start + length]
+                rest = sequence[:start] + sequence[start + length :]
+                for position in range(len(rest) + 1):
+                    if position != start:
+                        yield rest[:position] + segment + rest[position:]
+
+        # 2-opt: reverse sequence[start:end]
+        for start in range(size):
+            for end in range(start + 2, size + 1):
+                yield sequence[:start] + sequence[start:end][::-1] + sequence[end:]
+
+
+class BeamSearchRouteFinder(RouteFinder):
+    """
+    Anytime beam search over (node, mask) states, one popcount layer at a time,
+    keeping the beam_width states with the lowest cost + lower bound per layer.
+    A cheapest insertion route is the incumbent, so when time_budget runs out the
+    best complete route found so far is returned.
+
+    Any optimal route either survives every layer or has a prefix that was cut,
+    so min(best cut estimate, frontier estimates) is an exact lower bound; it is
+    reported in SearchStats with the relative optimality gap.
+    """
+
+    DEFAULT_BEAM_WIDTH = 64
+    DEFAULT_TIME_BUDGET_SECONDS = 0.05
+
+    @classmethod
+    def get_strategy(cls):
+        return RoutePlanningStrategy.BEAM_SEARCH
+
+    @classmethod
+    def find(
+        cls,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        stats: Optional[SearchStats] = None,
+        beam_width: int = DEFAULT_BEAM_WIDTH,
+        time_budget: float = DEFAULT_TIME_BUDGET_SECONDS,
+    ) -> RouteDTO:
+        deadline: float = time.monotonic() + time_budget
+        search_space: SearchSpace = cls._build_search_space(
+            graph, customer_restaurant_map
+        )
+        n = search_space.size
+        row_size = n + 1
+        weights = search_space.weights
+        required_masks = search_space.required_masks
+        restaurant_flags = search_space.restaurant_flags
+        min_available_times = search_space.min_available_times
+        zero = graph.zero_cost()
+        cheapest_incoming: List[Cost] = cls._get_cheapest_incoming(search_space)
+        bounds: Dict[int, Tuple[Cost, Cost]] = {}
+
+        best_sequence: List[int] = CheapestInsertionRouteFinder._construct(search_space)
+        best_cost: Cost = search_space.evaluate(best_sequence)
+
+        # entry: (estimate, cost, mask, node_index, parent_entry)
+        root_estimate: Cost = cls._get_lower_bound(
+            search_space, cheapest_incoming, bounds, 0, zero, zero
+        )
+        frontier: List[tuple] = [
+            (root_estimate, zero, 0, search_space.root_index, None)
+        ]
+        cut_estimate: Optional[Cost] = None
+        states_expanded = 0
+        states_pushed = 1
+
+        for _ in range(n):
+            if time.monotonic() >= deadline:
+                break
+
+            candidates: Dict[int, tuple] = {}
+            for entry in frontier:
+                _, cost, mask, index, _ = entry
+                states_expanded += 1
+                offset = index * row_size
+                for next_index in range(n):
+                    required_mask = required_masks[next_index]
+                    if (
+                        mask & (1 << next_index)
+                        or mask & required_mask != required_mask
+                    ):
+                        continue
+                    new_cost = cost + weights[offset + next_index]
+                    if restaurant_flags[next_index]:
+                        new_cost = max(min_available_times[next_index], new_cost)
+                    new_mask = mask | (1 << next_index)
+                    state = new_mask * row_size + next_index
+                    current = candidates.get(state)
+                    if current is None or new_cost < current[1]:
+                        estimate = new_cost + cls._get_lower_bound(
+                            search_space,
+                            cheapest_incoming,
+                            bounds,
+                            new_mask,
+                            new_cost,
+                            zero,
+                        )
+                        candidates[state] = (
+                            estimate,
+                            new_cost,
+                            new_mask,
+                            next_index,
+                            entry,
+                        )
+
+            ranked: List[tuple] = sorted(
+                candidates.values(), key=lambda candidate: candidate[:2]
+            )
+            frontier = ranked[:beam_width]
+            states_pushed += len(frontier)
+            if len(ranked) > beam_width and (
+                cut_estimate is None or ranked[beam_width][0] < cut_estimate
+            ):
+                cut_estimate = ranked[beam_width][0]
+        else:
+            if frontier and frontier[0][1] < best_cost:
+                best_cost = frontier[0][1]
+                best_sequence = cls._get_sequence(frontier[0])
+
+        lower_bound: Cost = min(entry[0] for entry in frontier)
+        if cut_estimate is not None:
+            lower_bound = min(lower_bound, cut_estimate)
+        lower_bound = min(max(lower_bound, root_estimate), best_cost)
+
+        cls._record_stats(stats, states_pushed, states_expanded)
+        if stats is not None:
+            stats.lower_bound = graph.to_decimal(lower_bound)
+            stats.optimality_gap = (
+                float((best_cost - lower_bound) / lower_bound) if lower_bound else 0.0
+            )
+
+        return cls._build_route(search_space, search_space.get_steps(best_sequence))
+
+    @classmethod
+    def _get_sequence(cls, entry: tuple) -> List[int]:
+        sequence: List[int] = []
+        while entry[4] is not None:
+            sequence.append(entry[3])
+            entry = entry[4]
+
+        sequence.reverse()
+        return sequence
+
+
+class BranchAndBoundRouteFinder(RouteFinder):
+    """
+    Exact depth first branch and bound over precedence feasible extensions.
+    The incumbent is seeded by cheapest insertion plus a short local search, and a
+    branch is cut when cost + lower bound (same bound as A*) reaches the incumbent.
+    Children are explored cheapest first; memory is the DFS stack, O(n^2) entries,
+    instead of a heap and visited set over all (node, mask) states.
+    """
+
+    SEED_TIME_BUDGET_SECONDS = 0.01
+
+    @classmethod
+    def get_strategy(cls):
+        return RoutePlanningStrategy.BRANCH_AND_BOUND
+
+    @classmethod
+    def find(
+        cls,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        stats: Optional[SearchStats] = None,
+    ) -> RouteDTO:
+        search_space: SearchSpace = cls._build_search_space(
+            graph, customer_restaurant_map
+        )
+        best_sequence, _ = CheapestInsertionRouteFinder._improve(
+            search_space,
+            CheapestInsertionRouteFinder._construct(search_space),
+            time.monotonic() + cls.SEED_TIME_BUDGET_SECONDS,
+        )
+        best_cost: Cost = search_space.evaluate(best_sequence)
+        best_sequence, best_cost = cls._search(
+            search_space,
+            search_space.root_index,
+            0,
+            graph.zero_cost(),
+            best_sequence,
+            best_cost,
+            stats,
+        )
+        return cls._build_route(search_space, search_space.get_steps(best_sequence))
+
+    @classmethod
+    def find_from_state(
+        cls,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        current_node: NodeDTO,
+        visited_mask: int,
+        elapsed_cost: Decimal,
+        warm_start: Optional[RouteDTO] = None,
+        stats: Optional[SearchStats] = None,
+    ) -> RouteDTO:
+        """
+        With a usable warm_start, its remaining stops are the incumbent and the
+        search runs straight from the given state; otherwise see RouteFinder.
+        """
+        search_space: SearchSpace = cls._build_search_space(
+            graph, customer_restaurant_map
+        )
+        start_index: int = cls._get_start_index(search_space, current_node)
+        start_cost: Cost = graph.to_cost(elapsed_cost)
+        best_sequence, best_cost = cls._get_warm_start(
+            search_space, warm_start, start_index, visited_mask, start_cost
+        )
+        if best_sequence is None:
+            return super().find_from_state(
+                graph,
+                customer_restaurant_map,
+                current_node,
+                visited_mask,
+                elapsed_cost,
+                stats=stats,
+            )
+
+        best_sequence, _ = cls._search(
+            search_space,
+            start_index,
+            visited_mask,
+            start_cost,
+            best_sequence,
+            best_cost,
+            stats,
+        )
+        return cls._build_route(
+            search_space,
+            search_space.get_steps(
+                best_sequence, start_index, visited_mask, start_cost
+            ),
+        )
+
+    @classmethod
+    def _search(
+        cls,
+        search_space: SearchSpace,
+        start_index: int,
+        start_mask: int,
+        start_cost: Cost,
+        best_sequence: List[int],
+        best_cost: Cost,
+        stats: Optional[SearchStats] = None,
+    ) -> Tuple[List[int], Cost]:
+        """
+        DFS from (start_index, start_mask, start_cost) for a sequence of the
+        remaining stops cheaper than best_cost.
+        """
+        n = search_space.size
+        row_size = n + 1
+        full_mask = search_space.full_mask
+        weights = search_space.weights
+        required_masks = search_space.required_masks
+        restaurant_flags = search_space.restaurant_flags
+        min_available_times = search_space.min_available_times
+        zero = search_space.graph.zero_cost()
+        cheapest_incoming: List[Cost] = cls._get_cheapest_incoming(search_space)
+        restaurants_by_time: List[int] = sorted(
+            (index for index in range(n) if restaurant_flags[index]),
+            key=lambda index: min_available_times[index],
+            reverse=True,
+        )
+        travel_bound: Cost = zero
+        for index in range(n):
+            if not start_mask & (1 << index):
+                travel_bound += cheapest_incoming[index]
+
+        path: List[int] = [0] * n
+        start_depth = bin(start_mask).count("1")
+        # entry: (estimate, cost, node_index, mask, travel_bound, depth)
+        stack: List[tuple] = [
+            (start_cost, start_cost, start_index, start_mask, travel_bound, start_depth)
+        ]
+        states_pushed = 1
+        states_expanded = 0
+        states_pruned = 0
+
+        while stack:
+            estimate, cost, index, mask, travel_bound, depth = stack.pop()
+            if estimate >= best_cost:
+                states_pruned += 1
+                continue
+
+            states_expanded += 1
+            if depth > start_depth:
+                path[depth - 1] = index
+            if mask == full_mask:
+                best_cost = cost
+                best_sequence = path[start_depth:depth]
+                continue
+
+            offset = index * row_size
+            children: List[tuple] = []
+            for next_index in range(n):
+                required_mask = required_masks[next_index]
+                if mask & (1 << next_index) or mask & required_mask != required_mask:
+                    continue
+                new_cost = cost + weights[offset + next_index]
+                if restaurant_flags[next_index]:
+                    new_cost = max(min_available_times[next_index], new_cost)
+                new_mask = mask | (1 << next_index)
+                new_travel_bound = travel_bound - cheapest_incoming[next_index]
+                latest_available_time = zero
+                for restaurant in restaurants_by_time:
+                    if not new_mask & (1 << restaurant):
+                        latest_available_time = min_available_times[restaurant]
+                        break
+                new_estimate = new_cost + max(
+                    new_travel_bound, latest_available_time - new_cost
+                )
+                if new_estimate >= best_cost:
+                    states_pruned += 1
+                    continue
+                children.append(
+                    (
+                        new_estimate,
+                        new_cost,
+                        next_index,
+                        new_mask,
+                        new_travel_bound,
+                        depth + 1,
                     )
-                    heapq.heappush(heap, (to_dijkstra_node, new_route))
+                )
+
+            children.sort(key=lambda child: child[:3], reverse=True)
+            stack.extend(children)
+            states_pushed += len(children)
+
+        cls._record_stats(stats, states_pushed, states_expanded)
+        if stats is not None:
+            stats.states_pruned += states_pruned
+
+        return best_sequence, best_cost
+
+
+class GeographicDecompositionRouteFinder(RouteFinder):
+    """
+    Splits a big batch into spatial clusters of at most max_cluster_stops stops,
+    solves each one exactly with DijkstraWithMaskRouteFinder and stitches the
+    cluster tours starting from the rider root.
+    Orders sharing a restaurant land in the same cluster when they fit. Clusters
+    are cut from a sweep of the orders by bearing around the rider; a bigger group
+    is cut on its own, restaurants first and customers swept around its first
+    restaurant, so a customer's restaurants are in its cluster or an earlier one.
+    The next cluster is the one with the cheapest edge from the current stop among
+    those whose restaurants outside the cluster are already visited. Each cluster is
+    solved on a subgraph rooted at the current stop with the elapsed cost, so
+    restaurant waits stay exact, and visited restaurants are dropped from its
+    precedence map.
+    The stitched sequence then gets the local search of CheapestInsertionRouteFinder
+    and is compared with that finder's own route, each within half of time_budget;
+    the cheaper of the two is returned.
+    stats.lower_bound holds for every route of the batch, see _get_route_lower_bound,
+    and stats.optimality_gap is the returned route's cost against it.
+    """
 
-        return best_route
+    DEFAULT_MAX_CLUSTER_STOPS = 8
+    DEFAULT_TIME_BUDGET_SECONDS = (
+        CheapestInsertionRouteFinder.DEFAULT_TIME_BUDGET_SECONDS
+    )
 
     @classmethod
-    def _all_restaurants_visited(
+    def get_strategy(cls):
+        return RoutePlanningStrategy.GEOGRAPHIC_DECOMPOSITION
+
+    @classmethod
+    def find(
         cls,
-        required_restaurants: List[uuid.UUID],
-        mask: int,
-        object_node_map: Dict[uuid.UUID, NodeDTO],
-        restaurant_index_map: Dict[NodeDTO, int],
-    ) -> bool:
-        return all(
-            map(
-                lambda index: mask & (1 << index),
-                [
-                    restaurant_index_map[object_node_map[restaurant]]
-                    for restaurant in required_restaurants
-                ],
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        stats: Optional[SearchStats] = None,
+        max_cluster_stops: int = DEFAULT_MAX_CLUSTER_STOPS,
+        time_budget: float = DEFAULT_TIME_BUDGET_SECONDS,
+    ) -> RouteDTO:
+        search_space: SearchSpace = cls._build_search_space(
+            graph, customer_restaurant_map
+        )
+        zero = graph.zero_cost()
+        node_index_map: Dict[NodeDTO, int] = cls._get_object_index_map(
+            search_space.nodes
+        )
+        clusters: List[List[int]] = cls._get_clusters(search_space, max_cluster_stops)
+
+        sequence: List[int] = []
+        index = search_space.root_index
+        mask = 0
+        cost: Cost = zero
+        while clusters:
+            cluster: List[int] = min(
+                (
+                    stops
+                    for stops in clusters
+                    if cls._is_ready(search_space, mask, stops)
+                ),
+                key=lambda stops: cls._get_entry_cost(search_space, index, mask, stops),
+            )
+            clusters.remove(cluster)
+            cluster_nodes: List[NodeDTO] = [
+                search_space.nodes[stop] for stop in cluster
+            ]
+            cluster_object_ids: Set[uuid.UUID] = {
+                node.object_id for node in cluster_nodes
+            }
+            route: Optional[RouteDTO] = DijkstraWithMaskRouteFinder.find(
+                graph.get_subgraph(search_space.get_node(index), cluster_nodes, cost),
+                {
+                    customer_id: [
+                        restaurant_id
+                        for restaurant_id in restaurant_ids
+                        if restaurant_id in cluster_object_ids
+                    ]
+                    for customer_id, restaurant_ids in customer_restaurant_map.items()
+                    if customer_id in cluster_object_ids
+                },
+                stats,
+            )
+            if route is None:
+                return None
+
+            cluster_sequence: List[int] = [
+                node_index_map[node] for node in cls._get_route_nodes(route)
+            ]
+            cost = search_space.evaluate(cluster_sequence, index, mask, cost)
+            for stop in cluster_sequence:
+                mask |= 1 << stop
+            sequence.extend(cluster_sequence)
+            index = sequence[-1] if sequence else index
+
+        sequence, evaluations = CheapestInsertionRouteFinder._improve(
+            search_space, sequence, time.monotonic() + time_budget / 2
+        )
+        insertion_sequence, insertion_evaluations = (
+            CheapestInsertionRouteFinder._improve(
+                search_space,
+                CheapestInsertionRouteFinder._construct(search_space),
+                time.monotonic() + time_budget / 2,
+            )
+        )
+        cls._record_stats(stats, 0, evaluations + insertion_evaluations)
+        cost = search_space.evaluate(sequence)
+        insertion_cost: Cost = search_space.evaluate(insertion_sequence)
+        if insertion_cost < cost:
+            sequence, cost = insertion_sequence, insertion_cost
+
+        if stats is not None and search_space.size:
+            lower_bound: Optional[Cost] = cls._get_route_lower_bound(search_space)
+            if lower_bound is not None:
+                lower_bound = min(lower_bound, cost)
+                stats.lower_bound = graph.to_decimal(lower_bound)
+                stats.optimality_gap = (
+                    float((cost - lower_bound) / lower_bound) if lower_bound else 0.0
+                )
+
+        return cls._build_route(search_space, search_space.get_steps(sequence))
+
+    @classmethod
+    def _get_route_lower_bound(cls, search_space: SearchSpace) -> Optional[Cost]:
+        """
+        Lower bound on the cost of every route over the batch, the larger of
+        - travel: every stop is entered once from a distinct predecessor (the root
+          or another stop), so the cheapest assignment of predecessors to stops
+          (HungarianAssignmentSolver) is at most the route's travel
+        - waits: a restaurant is reached no earlier than its min_available_time,
+          then it is left and each of its customers is entered from another stop
+        None when the assignment leaves a stop without a predecessor.
+        """
+        n = search_space.size
+        cost_matrix: List[List[float]] = [
+            [
+                (
+                    math.inf
+                    if search_space.weight(from_index, to_index) is None
+                    or from_index == to_index
+                    or (
+                        from_index == search_space.root_index
+                        and search_space.required_masks[to_index]
+                    )
+                    or (
+                        from_index < n
+                        and search_space.required_masks[from_index] & (1 << to_index)
+                    )
+                    else float(search_space.weight(from_index, to_index))
+                )
+                for from_index in range(n + 1)
+            ]
+            for to_index in range(n)
+        ]
+        assignment: List[Optional[int]] = HungarianAssignmentSolver.solve(cost_matrix)
+        if None in assignment:
+            return None
+
+        travel_bound: Cost = search_space.graph.zero_cost()
+        for to_index, from_index in enumerate(assignment):
+            travel_bound += search_space.weight(from_index, to_index)
+
+        lower_bound: Cost = travel_bound
+        for index in range(n):
+            if not search_space.restaurant_flags[index]:
+                continue
+            customers: List[int] = [
+                customer_index
+                for customer_index in range(n)
+                if search_space.required_masks[customer_index] & (1 << index)
+            ]
+            if not customers:
+                lower_bound = max(lower_bound, search_space.min_available_times[index])
+                continue
+            leave_cost: Cost = min(
+                search_space.weight(index, next_index)
+                for next_index in range(n)
+                if next_index != index
+                and search_space.weight(index, next_index) is not None
+            )
+            customers_cost: Cost = sum(
+                (
+                    min(
+                        search_space.weight(from_index, customer_index)
+                        for from_index in range(n)
+                        if cost_matrix[customer_index][from_index] != math.inf
+                    )
+                    for customer_index in customers
+                ),
+                search_space.graph.zero_cost(),
+            )
+            lower_bound = max(
+                lower_bound,
+                search_space.min_available_times[index]
+                + max(leave_cost, customers_cost),
+            )
+
+        return lower_bound
+
+    @classmethod
+    def _get_clusters(
+        cls, search_space: SearchSpace, max_cluster_stops: int
+    ) -> List[List[int]]:
+        root: HaversineNode = search_space.root
+        groups: List[List[int]] = cls._get_order_groups(search_space)
+        groups.sort(key=lambda group: cls._get_bearing(root, search_space, group))
+
+        clusters: List[List[int]] = []
+        cluster: List[int] = []
+        for group in groups:
+            if len(group) > max_cluster_stops:
+                stops: List[int] = cls._get_sweep(search_space, group)
+                clusters.extend(
+                    stops[start : start + max_cluster_stops]
+                    for start in range(0, len(stops), max_cluster_stops)
+                )
+                continue
+            if cluster and len(cluster) + len(group) > max_cluster_stops:
+                clusters.append(cluster)
+                cluster = []
+            cluster = cluster + group
+
+        if cluster:
+            clusters.append(cluster)
+        return clusters
+
+    @classmethod
+    def _get_sweep(cls, search_space: SearchSpace, group: List[int]) -> List[int]:
+        """
+        Restaurants of the group, then its customers by bearing around the first one.
+        """
+        restaurants: List[int] = [
+            index for index in group if search_space.restaurant_flags[index]
+        ]
+        customers: List[int] = [
+            index for index in group if not search_space.restaurant_flags[index]
+        ]
+        customers.sort(
+            key=lambda index: cls._get_bearing(
+                search_space.nodes[restaurants[0]], search_space, [index]
             )
         )
+        return restaurants + customers
+
+    @classmethod
+    def _get_order_groups(cls, search_space: SearchSpace) -> List[List[int]]:
+        """
+        Stops joined through shared restaurants (union find over required masks).
+        """
+        parents: List[int] = list(range(search_space.size))
+
+        def find_root(index: int) -> int:
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+
+        for index, required_mask in enumerate(search_space.required_masks):
+            for restaurant_index in range(search_space.size):
+                if required_mask & (1 << restaurant_index):
+                    parents[find_root(restaurant_index)] = find_root(index)
+
+        groups: Dict[int, List[int]] = {}
+        for index in range(search_space.size):
+            groups.setdefault(find_root(index), []).append(index)
+
+        return list(groups.values())
+
+    @classmethod
+    def _get_bearing(
+        cls, origin: HaversineNode, search_space: SearchSpace, group: List[int]
+    ) -> float:
+        latitude = sum(float(search_space.nodes[index].latitude) for index in group)
+        longitude = sum(float(search_space.nodes[index].longitude) for index in group)
+        return math.atan2(
+            latitude / len(group) - float(origin.latitude),
+            longitude / len(group) - float(origin.longitude),
+        )
+
+    @classmethod
+    def _is_ready(cls, search_space: SearchSpace, mask: int, stops: List[int]) -> bool:
+        """
+        Whether every restaurant the stops need is visited or in the stops.
+        """
+        available_mask: int = mask | sum(1 << stop for stop in stops)
+        return all(
+            search_space.required_masks[stop] & ~available_mask == 0 for stop in stops
+        )
 
     @classmethod
-    def _is_complete(cls, graph: Graph, node: DijkstraNode) -> bool:
-        n = len(graph.nodes) - 1
-        return node.mask & ((1 << n) - 1) == (1 << n) - 1
+    def _get_entry_cost(
+        cls, search_space: SearchSpace, from_index: int, mask: int, stops: List[int]
+    ) -> Cost:
+        return min(
+            search_space.weight(from_index, stop)
+            for stop in stops
+            if search_space.required_masks[stop] & ~mask == 0
+        )
+
+
+class CachedRouteFinder(RouteFinder):
+    """
+    LRU + TTL cache of found routes in front of a finder, keyed by a canonical
+    signature of the batch: rider speed, quantized root and stop coordinates in a
+    canonical order, prep times and the precedence map over that order.
+    Entries hold (stop position, cost) steps, so a hit rebuilds the RouteDTO chain
+    on the current graph's nodes and batches of other orders at the same places
+    share entries. Graphs without a vehicle_speed are not cached.
+    """
+
+    COORDINATE_DIGITS = 5
+    DEFAULT_CAPACITY = 10_000
+    DEFAULT_TTL_SECONDS = 300.0
+    ROOT_POSITION = -1
+
+    def __init__(
+        self,
+        route_finder: RouteFinder,
+        capacity: int = DEFAULT_CAPACITY,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+    ):
+        self.route_finder = route_finder
+        self.cache = LRUCache(capacity, ttl_seconds)
+
+    def get_strategy(self) -> RoutePlanningStrategy:
+        return self.route_finder.get_strategy()
+
+    def find(
+        self,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        stats: Optional[SearchStats] = None,
+        **kwargs,
+    ) -> RouteDTO:
+        if graph.vehicle_speed is None:
+            return self.route_finder.find(
+                graph, customer_restaurant_map, stats, **kwargs
+            )
+
+        stops: List[HaversineNode] = sorted(
+            graph.get_customer_nodes() + graph.get_restaurant_nodes(),
+            key=self._get_node_key,
+        )
+        key: tuple = self._get_key(graph, customer_restaurant_map, stops, kwargs)
+        steps: Optional[List[Tuple[int, Decimal]]] = self.cache.get(key)
+        if steps is not None:
+            return self._build_cached_route(graph, stops, steps)
+
+        route: Optional[RouteDTO] = self.route_finder.find(
+            graph, customer_restaurant_map, stats, **kwargs
+        )
+        if route is not None:
+            self.cache.put(key, self._get_cached_steps(route, stops))
+        return route
+
+    def find_from_state(self, *args, **kwargs) -> RouteDTO:
+        return self.route_finder.find_from_state(*args, **kwargs)
+
+    def get_stats(self) -> CacheStats:
+        return self.cache.get_stats()
+
+    def clear(self):
+        self.cache.clear()
+
+    def _get_key(
+        self,
+        graph: Graph,
+        customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]],
+        stops: List[HaversineNode],
+        kwargs: Dict[str, Any],
+    ) -> tuple:
+        positions: Dict[uuid.UUID, int] = {
+            stop.object_id: position for position, stop in enumerate(stops)
+        }
+        precedence: tuple = tuple(
+            tuple(
+                sorted(
+                    positions[restaurant_id]
+                    for restaurant_id in customer_restaurant_map.get(stop.object_id, [])
+                    if restaurant_id in positions
+                )
+            )
+            for stop in stops
+        )
+        return (
+            graph.cost_mode,
+            graph.vehicle_speed,
+            graph.elapsed_cost,
+            self._get_node_key(graph.root),
+            tuple(self._get_node_key(stop) for stop in stops),
+            precedence,
+            tuple(sorted(kwargs.items())),
+        )
+
+    def _get_node_key(self, node: HaversineNode) -> tuple:
+        return (
+            node.node_type.value,
+            round(float(node.latitude), self.COORDINATE_DIGITS),
+            round(float(node.longitude), self.COORDINATE_DIGITS),
+            node.min_available_time,
+        )
+
+    def _get_cached_steps(
+        self, route: RouteDTO, stops: List[HaversineNode]
+    ) -> List[Tuple[int, Decimal]]:
+        positions: Dict[NodeDTO, int] = self._get_object_index_map(stops)
+        steps: List[Tuple[int, Decimal]] = []
+        while route is not None:
+            steps.append(
+                (
+                    positions.get(route.node.get_node(), self.ROOT_POSITION),
+                    route.cost_till_here,
+                )
+            )
+            route = route.previous_route
+
+        steps.reverse()
+        return steps
+
+    def _build_cached_route(
+        self,
+        graph: Graph,
+        stops: List[HaversineNode],
+        steps: List[Tuple[int, Decimal]],
+    ) -> RouteDTO:
+        bit_map: Dict[NodeDTO, int] = {
+            node: 1 << index
+            for index, node in enumerate(
+                graph.get_customer_nodes() + graph.get_restaurant_nodes()
+            )
+        }
+        route: Optional[RouteDTO] = None
+        mask = 0
+        for position, cost in steps:
+            node: NodeDTO = (
+                graph.root if position == self.ROOT_POSITION else stops[position]
+            )
+            mask |= bit_map.get(node, 0)
+            route = RouteDTO(DijkstraNode(node, cost, mask), cost, previous_route=route)
+
+        return route
 
 
 class RouteFinderFactory:
     _STRATEGY_TO_ROUTE_FINDER = {
+        RoutePlanningStrategy.ALL_POSSIBLE_PATHS: HeldKarpRouteFinder(),
         RoutePlanningStrategy.DIJKSTRA_WITH_MASK: DijkstraWithMaskRouteFinder(),
+        RoutePlanningStrategy.COMPACT_DIJKSTRA_WITH_MASK: CompactDijkstraWithMaskRouteFinder(),
+        RoutePlanningStrategy.A_STAR_WITH_MASK: AStarWithMaskRouteFinder(),
+        RoutePlanningStrategy.CHEAPEST_INSERTION_WITH_LOCAL_SEARCH: CheapestInsertionRouteFinder(),
+        RoutePlanningStrategy.BEAM_SEARCH: BeamSearchRouteFinder(),
+        RoutePlanningStrategy.BRANCH_AND_BOUND: BranchAndBoundRouteFinder(),
+        RoutePlanningStrategy.PARALLEL_ALL_POSSIBLE_PATHS: ParallelHeldKarpRouteFinder(),
+        RoutePlanningStrategy.VECTORIZED_ALL_POSSIBLE_PATHS: VectorizedHeldKarpRouteFinder(),
+        RoutePlanningStrategy.GEOGRAPHIC_DECOMPOSITION: GeographicDecompositionRouteFinder(),
+    }
+    _STRATEGY_TO_CACHED_ROUTE_FINDER = {
+        strategy: CachedRouteFinder(route_finder)
+        for strategy, route_finder in _STRATEGY_TO_ROUTE_FINDER.items()
     }
 
     @classmethod
     def get_route_finder(cls, strategy: RoutePlanningStrategy) -> RouteFinder:
         return cls._STRATEGY_TO_ROUTE_FINDER.get(strategy)
+
+    @classmethod
+    def get_cached_route_finder(
+        cls, strategy: RoutePlanningStrategy
+    ) -> CachedRouteFinder:
+        return cls._STRATEGY_TO_CACHED_ROUTE_FINDER.get(strategy)
@@ -0,0 +1,118 @@
+import math
+import time
+import unittest
+import uuid
+from decimal import Decimal
+from typing import Dict, List
+
+from graphs.builder import GraphBuilder
+from graphs.dto import Graph
+from locations.enums import LocationType
+from locations.model import Location
+from locations.service import LocationService
+from order_matcher.service import OrderMatcher
+from orders.model import Order
+from orders.service import OrderService
+from restaurants.model import Restaurant
+from restaurants.service import RestaurantService
+from route_finder.dto import RouteDTO, SearchSpace, SearchStats
+from route_finder.service import GeographicDecompositionRouteFinder
+from users.model import Customer, Rider
+from users.service import CustomerService, RiderService
+from utils import flatten
+
+PRECISION = Decimal("1.00000")
+
+
+class GeographicDecompositionRouteFinderTest(unittest.TestCase):
+    ORDER_COUNT = 18
+    MAX_CLUSTER_STOPS = GeographicDecompositionRouteFinder.DEFAULT_MAX_CLUSTER_STOPS
+    TIME_BUDGET_SECONDS = 1.0
+
+    def setUp(self):
+        restaurant: Restaurant = RestaurantService.create(
+            "RESTAURANT", "RESTAURANT_PHONE", Decimal("20")
+        )
+        self._create_location(restaurant.id, LocationType.RESTAURANT, 0.0, 0.0)
+        orders: List[Order] = []
+        for index in range(self.ORDER_COUNT):
+            customer: Customer = CustomerService.create(
+                f"CUSTOMER:{index}", f"CUSTOMER_PHONE:{index}"
+            )
+            angle: float = 2 * math.pi * index / self.ORDER_COUNT
+            radius: float = 0.02 + 0.002 * index
+            self._create_location(
+                customer.id,
+                LocationType.CUSTOMER,
+                radius * math.cos(angle),
+                radius * math.sin(angle),
+            )
+            orders.append(
+                OrderService.create(customer.id, restaurant.id, Decimal("100"))
+            )
+
+        rider: Rider = RiderService.create("RIDER", "RIDER_PHONE", Decimal("0.5"))
+        self._create_location(rider.id, LocationType.RIDER, -0.03, 0.01)
+        locations: List[Location] = OrderMatcher.get_locations(orders)
+        locations.append(LocationService.get_latest_by_object_id(rider.id))
+        self.graph: Graph = GraphBuilder.build(rider, locations)
+        self.customer_restaurant_map: Dict[uuid.UUID, List[uuid.UUID]] = (
+            OrderMatcher.get_customer_restaurant_map(orders)
+        )
+
+    def test_single_restaurant_batch_is_split_into_bounded_clusters(self):
+        search_space: SearchSpace = (
+            GeographicDecompositionRouteFinder._build_search_space(
+                self.graph, self.customer_restaurant_map
+            )
+        )
+        clusters: List[List[int]] = GeographicDecompositionRouteFinder._get_clusters(
+            search_space, self.MAX_CLUSTER_STOPS
+        )
+
+        self.assertGreater(len(clusters), 1)
+        self.assertTrue(
+            all(len(cluster) <= self.MAX_CLUSTER_STOPS for cluster in clusters)
+        )
+        self.assertEqual(
+            sorted(stop for cluster in clusters for stop in cluster),
+            list(range(search_space.size)),
+        )
+
+    def test_single_restaurant_batch_finishes_within_time_budget(self):
+        stats = SearchStats()
+        started_at: float = time.monotonic()
+        route: RouteDTO = GeographicDecompositionRouteFinder.find(
+            self.graph,
+            self.customer_restaurant_map,
+            stats,
+            max_cluster_stops=self.MAX_CLUSTER_STOPS,
+            time_budget=self.TIME_BUDGET_SECONDS,
+        )
+        elapsed: float = time.monotonic() - started_at
+
+        self.assertLess(elapsed, self.TIME_BUDGET_SECONDS)
+        stops: List[RouteDTO] = flatten(route)[1:]
+        self.assertEqual(len(stops), self.ORDER_COUNT + 1)
+        self.assertTrue(stops[0].node.get_node().is_restaurant())
+        self.assertLessEqual(stats.lower_bound, route.cost_till_here)
+        self.assertGreaterEqual(stats.optimality_gap, 0.0)
+
+    @classmethod
+    def _create_location(
+        cls,
+        object_id: uuid.UUID,
+        location_type: LocationType,
+        latitude: float,
+        longitude: float,
+    ):
+        LocationService.create(
+            object_id,
+            location_type,
+            Decimal(77.6 + longitude).quantize(PRECISION),
+            Decimal(12.9 + latitude).quantize(PRECISION),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
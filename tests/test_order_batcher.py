@@ -0,0 +1,83 @@
+import unittest
+import uuid
+from decimal import Decimal
+from typing import List
+from unittest import mock
+
+from locations.enums import LocationType
+from locations.service import LocationService
+from order_batcher.service import OrderBatcher
+from orders.model import Order
+from orders.service import OrderService
+from restaurants.model import Restaurant
+from restaurants.service import RestaurantService
+from users.model import Customer
+from users.service import CustomerService
+
+PRECISION = Decimal("1.00000")
+
+
+class OrderBatcherQueueTest(unittest.TestCase):
+    MAX_QUEUED_ORDERS = 4
+    ORDER_COUNT = 10
+
+    def setUp(self):
+        OrderBatcher.clear()
+        self.restaurant: Restaurant = RestaurantService.create(
+            "RESTAURANT", "RESTAURANT_PHONE", Decimal("20")
+        )
+        self._create_location(self.restaurant.id, LocationType.RESTAURANT, 0)
+
+    def tearDown(self):
+        OrderBatcher.clear()
+
+    def test_queue_stays_bounded_without_batch_runs(self):
+        orders: List[Order] = []
+        with mock.patch.object(
+            OrderBatcher, "MAX_QUEUED_ORDERS", self.MAX_QUEUED_ORDERS
+        ):
+            for index in range(self.ORDER_COUNT):
+                orders.append(self._create_order(index))
+                self.assertLess(len(OrderBatcher._new_orders), self.MAX_QUEUED_ORDERS)
+
+        batched_order_ids = {
+            order.id for batch in OrderBatcher.get_batches() for order in batch.orders
+        }
+        queued_order_ids = {order.id for order in OrderBatcher._new_orders}
+        self.assertEqual(
+            batched_order_ids | queued_order_ids, {order.id for order in orders}
+        )
+        self.assertFalse(batched_order_ids & queued_order_ids)
+
+        OrderBatcher.batch_pending_orders()
+        self.assertFalse(OrderBatcher._new_orders)
+        self.assertEqual(
+            {
+                order.id
+                for batch in OrderBatcher.get_batches()
+                for order in batch.orders
+            },
+            {order.id for order in orders},
+        )
+
+    def _create_order(self, index: int) -> Order:
+        customer: Customer = CustomerService.create(
+            f"CUSTOMER:{index}", f"CUSTOMER_PHONE:{index}"
+        )
+        self._create_location(customer.id, LocationType.CUSTOMER, index + 1)
+        return OrderService.create(customer.id, self.restaurant.id, Decimal("100"))
+
+    @classmethod
+    def _create_location(
+        cls, object_id: uuid.UUID, location_type: LocationType, offset: int
+    ):
+        LocationService.create(
+            object_id,
+            location_type,
+            Decimal(77.6 + 0.001 * offset).quantize(PRECISION),
+            Decimal(12.9).quantize(PRECISION),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -41,6 +41,10 @@ class RiderService:
     def get_by_id(cls, rider_id: uuid.UUID) -> Rider:
         return RiderRepository.get_by_id(rider_id)
 
+    @classmethod
+    def is_active(cls, rider_id: uuid.UUID) -> bool:
+        return RiderRepository.get_by_id(rider_id).status == UserStatus.ACTIVE
+
     @classmethod
     def get_active_riders(cls) -> List[Rider]:
         return [